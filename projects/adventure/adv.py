@@ -1,9 +1,11 @@
 from room import Room
 from player import Player
 from world import World
+from map_loader import load_world
+from traversal import plan_traversal
+from viewport import Viewport
 
 import random
-from ast import literal_eval
 
 # Load world
 world = World()
@@ -16,9 +18,8 @@ world = World()
 # map_file = "maps/test_loop_fork.txt"
 map_file = "maps/main_maze.txt"
 
-# Loads the map into a dictionary
-room_graph=literal_eval(open(map_file, "r").read())
-world.load_graph(room_graph)
+# Streams the map file straight into the world
+load_world(map_file, world)
 
 # Print an ASCII map
 world.print_rooms()
@@ -27,7 +28,7 @@ player = Player(world.starting_room)
 
 # Fill this out with directions to walk
 # traversal_path = ['n', 'n']
-traversal_path = []
+traversal_path = plan_traversal(world, optimized=True, trials=5)
 
 
 
@@ -40,22 +41,25 @@ for move in traversal_path:
     player.travel(move)
     visited_rooms.add(player.current_room)
 
-if len(visited_rooms) == len(room_graph):
+if len(visited_rooms) == len(world.rooms):
     print(f"TESTS PASSED: {len(traversal_path)} moves, {len(visited_rooms)} rooms visited")
 else:
     print("TESTS FAILED: INCOMPLETE TRAVERSAL")
-    print(f"{len(room_graph) - len(visited_rooms)} unvisited rooms")
+    print(f"{len(world.rooms) - len(visited_rooms)} unvisited rooms")
 
 
 
 #######
 # UNCOMMENT TO WALK AROUND
 #######
+viewport = Viewport(world)
 player.current_room.print_room_description(player)
 while True:
     cmds = input("-> ").lower().split(" ")
     if cmds[0] in ["n", "s", "e", "w"]:
         player.travel(cmds[0], True)
+    elif cmds[0] == "m":
+        print(viewport.render_around(player.current_room))
     elif cmds[0] == "q":
         break
     else:
@@ -0,0 +1,71 @@
+"""
+Benchmark world startup: literal_eval + World.load_graph against the
+streaming loader reading the same map in the dict and .rooms formats.
+
+Run with: python bench_maploader.py
+"""
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+from ast import literal_eval
+
+from map_loader import load_world, write_legacy, write_stream
+from world import World
+
+
+def comb_records(num_rooms):
+    # a corridor along y = 0 with a dead-end tooth going north from every
+    # cell, which keeps every room reachable on a square grid
+    side = math.isqrt(num_rooms - 1) + 1
+    for room_id in range(num_rooms):
+        x, y = divmod(room_id, side)
+        exits = {}
+        if y == 0 and x > 0:
+            exits["w"] = room_id - side
+        if y == 0 and room_id + side < num_rooms:
+            exits["e"] = room_id + side
+        if y > 0:
+            exits["s"] = room_id - 1
+        if y < side - 1 and room_id + 1 < num_rooms:
+            exits["n"] = room_id + 1
+        yield room_id, x, y, exits
+
+
+def literal_eval_startup(map_file):
+    world = World()
+    world.load_graph(literal_eval(open(map_file, "r").read()))
+    return world
+
+
+def measure(load, map_file):
+    start = time.perf_counter()
+    load(map_file)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    load(map_file)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes=(500, 50000, 200000)):
+    loaders = (
+        ("literal_eval", literal_eval_startup, ".txt"),
+        ("stream .txt", load_world, ".txt"),
+        ("stream .rooms", load_world, ".rooms"),
+    )
+    print(f"{'rooms':>7} {'loader':>14} {'time':>9} {'peak memory':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for num_rooms in sizes:
+            legacy = os.path.join(directory, f"comb_{num_rooms}.txt")
+            write_legacy(comb_records(num_rooms), legacy)
+            write_stream(comb_records(num_rooms), legacy[:-4] + ".rooms")
+            for name, load, extension in loaders:
+                elapsed, peak = measure(load, legacy[:-4] + extension)
+                print(f"{num_rooms:>7} {name:>14} {elapsed:>8.3f}s {peak / 2 ** 20:>10.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Report how fast candidate traversal paths are validated one move at a
+time through Player.travel and in batches with replay_paths.
+
+Run with: python bench_replay.py [num_paths]
+"""
+import contextlib
+import io
+import random
+import sys
+import time
+
+from map_loader import load_world
+from player import Player
+from replay import replay_paths
+from traversal import plan_traversal
+
+
+def player_replay(world, paths):
+    results = []
+    # Player.travel prints a message for every invalid move
+    with contextlib.redirect_stdout(io.StringIO()):
+        for path in paths:
+            player = Player(world.starting_room)
+            visited = {player.current_room}
+            for move in path:
+                player.travel(move)
+                visited.add(player.current_room)
+            results.append(len(visited))
+    return results
+
+
+def main(num_paths=2000):
+    world = load_world("maps/main_maze.txt")
+    rng = random.Random(1)
+    paths = []
+    for i in range(num_paths):
+        path = plan_traversal(world, seed=i) if i < 20 else list(rng.choice(paths))
+        # damage some copies so a share of the paths has invalid steps
+        if i >= 20 and rng.random() < 0.5:
+            path[rng.randrange(len(path))] = rng.choice("nsew")
+        paths.append(path)
+    moves = sum(len(path) for path in paths)
+    print(f"{num_paths} paths, {moves} moves on main_maze")
+
+    start = time.perf_counter()
+    expected = player_replay(world, paths)
+    elapsed = time.perf_counter() - start
+    print(f"{'Player.travel':>22} {elapsed:>8.2f}s {moves / elapsed / 1e6:>7.2f}M moves/s")
+
+    for max_workers in (1, None):
+        start = time.perf_counter()
+        results = replay_paths(world, paths, max_workers=max_workers)
+        elapsed = time.perf_counter() - start
+        assert [result["num_rooms_visited"] for result in results] == expected
+        label = "replay_paths, 1 proc" if max_workers == 1 else "replay_paths, pool"
+        print(f"{label:>22} {elapsed:>8.2f}s {moves / elapsed / 1e6:>7.2f}M moves/s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
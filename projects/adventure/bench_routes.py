@@ -0,0 +1,46 @@
+"""
+Report build time, cache load time and memory of the route table for
+main_maze.txt (500 rooms) and a 10k-room random maze.
+
+Run with: python bench_routes.py
+"""
+import os
+import random
+import tempfile
+import time
+
+from map_loader import load_world
+from maze_generator import maze_records
+from world import World
+
+
+def report(name, world, num_queries=10000):
+    with tempfile.TemporaryDirectory() as directory:
+        cache_file = os.path.join(directory, "routes.bin")
+        start = time.perf_counter()
+        table = world.build_route_table(cache_file)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        world.build_route_table(cache_file)
+        loaded = time.perf_counter() - start
+
+    rng = random.Random(1)
+    rooms = list(world.rooms.values())
+    start = time.perf_counter()
+    for _ in range(num_queries):
+        world.route(rng.choice(rooms), rng.choice(rooms))
+    queries = time.perf_counter() - start
+    print(f"{name:>12} {len(rooms):>6} {built:>8.2f}s {loaded:>8.3f}s"
+          f" {table.nbytes() / 2 ** 20:>9.2f}MB {queries / num_queries * 1e6:>9.1f}us")
+
+
+def main():
+    print(f"{'map':>12} {'rooms':>6} {'build':>9} {'cached':>9} {'memory':>11} {'per route':>11}")
+    report("main_maze", load_world("maps/main_maze.txt"))
+    world = World()
+    world.load_rooms(maze_records(10000, seed=1))
+    report("random maze", world)
+
+
+if __name__ == '__main__':
+    main()
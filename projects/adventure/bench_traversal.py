@@ -0,0 +1,35 @@
+"""
+Report the run time and move count of the traversal planner on
+main_maze.txt and on larger random mazes.
+
+Run with: python bench_traversal.py
+"""
+import time
+
+from map_loader import load_world
+from maze_generator import maze_records
+from traversal import count_visited, plan_traversal
+from world import World
+
+
+def report(name, world):
+    for optimized, trials in ((False, 1), (True, 1), (True, 5)):
+        start = time.perf_counter()
+        path = plan_traversal(world, optimized=optimized, trials=trials, seed=1)
+        elapsed = time.perf_counter() - start
+        assert count_visited(world.starting_room, path) == len(world.rooms)
+        mode = f"optimized x{trials}" if optimized else "plain"
+        print(f"{name:>14} {len(world.rooms):>7} {mode:>14} {len(path):>8} {elapsed:>8.2f}s")
+
+
+def main(sizes=(10000, 50000)):
+    print(f"{'map':>14} {'rooms':>7} {'mode':>14} {'moves':>8} {'time':>9}")
+    report("main_maze", load_world("maps/main_maze.txt"))
+    for num_rooms in sizes:
+        world = World()
+        world.load_rooms(maze_records(num_rooms, seed=1))
+        report("random maze", world)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Drive a SessionEngine with many simulated players and report commands
+per second and command latency percentiles.
+
+Run with: python load_test.py [num_sessions] [commands_per_session] [map_file]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from map_loader import load_world
+from sessions import SessionEngine
+
+COMMANDS = ("n", "s", "e", "w", "look")
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def _client(engine, session_id, num_commands, rng, latencies):
+    for _ in range(num_commands):
+        command = rng.choice(COMMANDS)
+        start = time.perf_counter()
+        await engine.submit(session_id, command)
+        latencies.append(time.perf_counter() - start)
+
+
+async def load_test(world, num_sessions, commands_per_session, seed=None, tick_interval=0.0):
+    """
+    Open num_sessions sessions that each send commands_per_session random
+    commands, waiting for every result before sending the next one, and
+    return the throughput and latency figures (None for the latencies
+    if no command was sent).
+    """
+    engine = SessionEngine(world, tick_interval)
+    runner = asyncio.create_task(engine.run())
+    await asyncio.sleep(0)
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(engine, engine.open_session(), commands_per_session, random.Random(rng.random()), latencies)
+        for _ in range(num_sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    engine.stop()
+    await runner
+
+    latencies.sort()
+    if len(latencies) == 0:
+        return {"commands": 0, "seconds": elapsed, "commands_per_second": 0.0, "p50": None, "p95": None, "p99": None}
+    return {
+        "commands": len(latencies),
+        "seconds": elapsed,
+        "commands_per_second": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+if __name__ == '__main__':
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    commands_per_session = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    map_file = sys.argv[3] if len(sys.argv) > 3 else "maps/main_maze.txt"
+    report = asyncio.run(load_test(load_world(map_file), num_sessions, commands_per_session, seed=1))
+    print(f"{num_sessions} sessions, {report['commands']} commands in {report['seconds']:.2f}s")
+    if report["commands"] > 0:
+        print(f"  {report['commands_per_second']:.0f} commands/s")
+        print(f"  latency p50 {report['p50'] * 1e3:.2f}ms"
+              f"  p95 {report['p95'] * 1e3:.2f}ms  p99 {report['p99'] * 1e3:.2f}ms")
@@ -0,0 +1,118 @@
+"""
+Streaming reader and writer for adventure map files
+
+Two formats are supported:
+
+* the original dict format of maps/*.txt, one room per line:
+      494: [(1, 8), {'e': 457}],
+* a line-oriented ".rooms" format with one record per room:
+      494 1 8 e=457
+
+Both are read one line at a time, so World.load_rooms can build the
+rooms while the file is read, without parsing the whole text first.
+"""
+import re
+
+_LEGACY_ROOM = re.compile(r"\s*(\d+)\s*:\s*\[\s*\(\s*(-?\d+)\s*,\s*(-?\d+)\s*\)\s*,\s*\{([^}]*)\}\s*\]\s*,?\s*$")
+_LEGACY_EXIT = re.compile(r"['\"]([nsew])['\"]\s*:\s*(\d+)")
+
+
+def iter_legacy_records(lines):
+    """
+    Yield (room_id, x, y, exits) records from lines in the dict format.
+    """
+    for line_number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if stripped in ("", "{", "}"):
+            continue
+        match = _LEGACY_ROOM.match(line)
+        if match is None:
+            raise ValueError(f"Line {line_number} is not a room: {stripped}")
+        room_id, x, y, exits = match.groups()
+        yield int(room_id), int(x), int(y), {
+            direction: int(target_id) for direction, target_id in _LEGACY_EXIT.findall(exits)
+        }
+
+
+def iter_stream_records(lines):
+    """
+    Yield (room_id, x, y, exits) records from lines in the .rooms format.
+    """
+    for line_number, line in enumerate(lines, 1):
+        fields = line.split()
+        if len(fields) == 0 or fields[0].startswith("#"):
+            continue
+        try:
+            exits = {}
+            for field in fields[3:]:
+                direction, target_id = field.split("=")
+                exits[direction] = int(target_id)
+            yield int(fields[0]), int(fields[1]), int(fields[2]), exits
+        except ValueError:
+            raise ValueError(f"Line {line_number} is not a room: {line.strip()}")
+
+
+def iter_records(map_file):
+    """
+    Yield the room records of a map file in either format, picking the
+    format from the first character of the file.
+    """
+    with open(map_file, "r") as lines:
+        first = lines.read(1)
+        lines.seek(0)
+        if first == "{":
+            yield from iter_legacy_records(lines)
+        else:
+            yield from iter_stream_records(lines)
+
+
+def load_world(map_file, world=None):
+    """
+    Load a map file into world (a new World by default) and return it.
+    """
+    if world is None:
+        from world import World
+        world = World()
+    world.load_rooms(iter_records(map_file))
+    return world
+
+
+def write_stream(records, map_file):
+    """
+    Write (room_id, x, y, exits) records in the .rooms format.
+    """
+    with open(map_file, "w") as out:
+        out.write("# room_id x y direction=room_id ...\n")
+        for room_id, x, y, exits in records:
+            fields = [f"{room_id} {x} {y}"]
+            fields.extend(f"{direction}={target_id}" for direction, target_id in exits.items())
+            out.write(" ".join(fields) + "\n")
+
+
+def write_legacy(records, map_file):
+    """
+    Write (room_id, x, y, exits) records in the original dict format,
+    which literal_eval can still read.
+    """
+    with open(map_file, "w") as out:
+        out.write("{\n")
+        for room_id, x, y, exits in records:
+            exit_text = ", ".join(f"'{direction}': {target_id}" for direction, target_id in exits.items())
+            out.write(f"  {room_id}: [({x}, {y}), {{{exit_text}}}],\n")
+        out.write("}\n")
+
+
+def convert(source_file, target_file):
+    """
+    Convert a map file to the format picked by the target's extension:
+    .rooms for the streaming format, anything else for the dict format.
+    """
+    if target_file.endswith(".rooms"):
+        write_stream(iter_records(source_file), target_file)
+    else:
+        write_legacy(iter_records(source_file), target_file)
+
+
+if __name__ == '__main__':
+    import sys
+    convert(sys.argv[1], sys.argv[2])
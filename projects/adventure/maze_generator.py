@@ -0,0 +1,118 @@
+"""
+Seeded generator for large adventure mazes
+
+Run with: python maze_generator.py num_rooms map_file [seed] [loop_fraction]
+
+The maze is a random spanning tree over the first num_rooms cells of a
+square grid, plus loop_fraction * num_rooms extra passages. Files ending
+in .rooms are written in the streaming format, anything else in the
+dict format of maps/*.txt.
+"""
+import math
+import random
+import sys
+from array import array
+
+from map_loader import write_legacy, write_stream
+
+# one bit per open side of a cell
+NORTH, SOUTH, EAST, WEST = 1, 2, 4, 8
+OPPOSITE = {NORTH: SOUTH, SOUTH: NORTH, EAST: WEST, WEST: EAST}
+NAMES = ((NORTH, "n"), (SOUTH, "s"), (EAST, "e"), (WEST, "w"))
+
+
+class Maze:
+    """
+    Cell i of the maze sits at (i // side, i % side) and is room i; its
+    open sides are the bits of exits[i].
+    """
+
+    def __init__(self, num_rooms, seed=None, loop_fraction=0.05):
+        self.num_rooms = num_rooms
+        self.side = math.isqrt(num_rooms - 1) + 1
+        self.exits = bytearray(num_rooms)
+        rng = random.Random(seed)
+        self._carve(rng)
+        self._add_loops(rng, int(num_rooms * loop_fraction))
+
+    def neighbor(self, cell, side):
+        """
+        Return the cell next to cell on the given side, or -1 if that
+        would leave the maze.
+        """
+        y = cell % self.side
+        if side == NORTH:
+            other = cell + 1 if y + 1 < self.side else -1
+        elif side == SOUTH:
+            other = cell - 1 if y > 0 else -1
+        elif side == EAST:
+            other = cell + self.side
+        else:
+            other = cell - self.side
+        return other if 0 <= other < self.num_rooms else -1
+
+    def _open(self, cell, side, other):
+        self.exits[cell] |= side
+        self.exits[other] |= OPPOSITE[side]
+
+    def _carve(self, rng):
+        # iterative randomized depth-first search: every cell is pushed
+        # once, so time and memory are linear in the number of rooms
+        visited = bytearray(self.num_rooms)
+        visited[0] = 1
+        stack = array("q", [0])
+        sides = (NORTH, SOUTH, EAST, WEST)
+        while len(stack) > 0:
+            cell = stack[-1]
+            options = []
+            for side in sides:
+                other = self.neighbor(cell, side)
+                if other >= 0 and not visited[other]:
+                    options.append((side, other))
+            if len(options) == 0:
+                stack.pop()
+                continue
+            side, other = options[rng.randrange(len(options))]
+            self._open(cell, side, other)
+            visited[other] = 1
+            stack.append(other)
+
+    def _add_loops(self, rng, num_loops):
+        for _ in range(num_loops):
+            cell = rng.randrange(self.num_rooms)
+            side = (NORTH, SOUTH, EAST, WEST)[rng.randrange(4)]
+            other = self.neighbor(cell, side)
+            if other >= 0:
+                self._open(cell, side, other)
+
+    def records(self):
+        """
+        Yield (room_id, x, y, exits) records, as World.load_rooms takes.
+        """
+        for cell in range(self.num_rooms):
+            x, y = divmod(cell, self.side)
+            mask = self.exits[cell]
+            yield cell, x, y, {
+                name: self.neighbor(cell, side) for side, name in NAMES if mask & side
+            }
+
+
+def maze_records(num_rooms, seed=None, loop_fraction=0.05):
+    return Maze(num_rooms, seed, loop_fraction).records()
+
+
+def write_maze(num_rooms, map_file, seed=None, loop_fraction=0.05):
+    records = maze_records(num_rooms, seed, loop_fraction)
+    if map_file.endswith(".rooms"):
+        write_stream(records, map_file)
+    else:
+        write_legacy(records, map_file)
+
+
+if __name__ == '__main__':
+    write_maze(
+        int(sys.argv[1]),
+        sys.argv[2],
+        int(sys.argv[3]) if len(sys.argv) > 3 else None,
+        float(sys.argv[4]) if len(sys.argv) > 4 else 0.05
+    )
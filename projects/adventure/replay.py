@@ -0,0 +1,131 @@
+"""
+Replay many traversal paths against a World at once
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from operator import eq
+
+DIRECTIONS = ("n", "s", "e", "w")
+CODES = {direction: d for d, direction in enumerate(DIRECTIONS)}
+# byte value of each direction in a path -> its index in DIRECTIONS, and
+# 4 (stay in place) for anything else
+STEP_CODES = bytes(CODES.get(chr(byte), 4) for byte in range(256))
+
+# set in every worker process by _load_table
+_table = None
+
+
+def transition_table(world):
+    """
+    Return (room_ids, moves) for world. Rooms get a dense index in
+    sorted ID order, and moves[4 * i + d] is the index of the room in
+    DIRECTIONS[d] from room i, or -1 if there is no exit that way.
+    """
+    room_ids = sorted(world.rooms)
+    index = {room_id: i for i, room_id in enumerate(room_ids)}
+    moves = array("q", [-1]) * (4 * len(room_ids))
+    for i, room_id in enumerate(room_ids):
+        room = world.rooms[room_id]
+        for d, direction in enumerate(DIRECTIONS):
+            next_room = room.get_room_in_direction(direction)
+            if next_room is not None:
+                moves[4 * i + d] = index[next_room.id]
+    return room_ids, moves
+
+
+def _step_table(moves):
+    """
+    Widen the transition table to five slots per room, holding the slot
+    offset of the next room rather than its index. The fifth slot and
+    missing exits point back at the room itself, so a walk is a single
+    lookup per step.
+    """
+    steps = []
+    for i in range(len(moves) // 4):
+        for d in range(4):
+            steps.append(5 * moves[4 * i + d] if moves[4 * i + d] >= 0 else 5 * i)
+        steps.append(5 * i)
+    return steps
+
+
+def _replay(steps, start, paths):
+    """
+    Return (slot offsets of the rooms visited, in first-visit order,
+    valid moves, first invalid step) for each path walked from slot
+    offset start. Like Player.travel, an invalid
+    step leaves the player where they are and the walk goes on.
+    """
+    results = []
+    for path in paths:
+        if isinstance(path, str):
+            codes = path.encode("latin-1", "replace").translate(STEP_CODES)
+        else:
+            # each entry is one move, however many characters it has
+            codes = bytes(map(CODES.get, path, repeat(4)))
+        position = start
+        trail = [position]
+        append = trail.append
+        for code in codes:
+            position = steps[position + code]
+            append(position)
+        # rooms have no exits to themselves, so a step is invalid
+        # exactly when the position did not change
+        stayed = list(map(eq, trail, islice(trail, 1, None)))
+        first_invalid = stayed.index(True) if True in stayed else None
+        results.append((list(dict.fromkeys(trail)), len(codes) - sum(stayed), first_invalid))
+    return results
+
+
+def _load_table(steps):
+    global _table
+    _table = steps
+
+
+def _worker_replay(job):
+    start, paths = job
+    return _replay(_table, start, paths)
+
+
+def replay_paths(world, paths, starting_room=None, max_workers=1, chunk_size=256):
+    """
+    Walk every path (a string or list of "n", "s", "e", "w" moves) from
+    starting_room (world.starting_room by default) and return, in the
+    same order, a dictionary per path with the IDs of the
+    "rooms_visited" in the order they were first entered, their number
+    "num_rooms_visited", the number of valid "moves" and the index of
+    the "first_invalid" step (None if every step was valid). A string path
+    is one move per character, a list path one move per entry; anything
+    but "n", "s", "e" or "w" is an invalid move, as for Player.travel.
+
+    By default the paths run in this process. Any other max_workers
+    (None for one per CPU) hands groups of chunk_size paths to a process
+    pool that gets the transition table once per worker, which only pays
+    off with several cores and many long paths.
+    """
+    if starting_room is None:
+        starting_room = world.starting_room
+    room_ids, moves = transition_table(world)
+    steps = _step_table(moves)
+    start = 5 * room_ids.index(starting_room.id)
+    paths = list(paths)
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    if max_workers == 1:
+        results = [_replay(steps, start, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_load_table, initargs=(steps,)) as pool:
+            results = list(pool.map(_worker_replay, [(start, chunk) for chunk in chunks]))
+
+    # room ID at each room's slot offset
+    slot_ids = [room_id for room_id in room_ids for _ in range(5)]
+    return [
+        {
+            "rooms_visited": list(map(slot_ids.__getitem__, visited)),
+            "num_rooms_visited": len(visited),
+            "moves": valid,
+            "first_invalid": first_invalid,
+        }
+        for chunk in results
+        for visited, valid, first_invalid in chunk
+    ]
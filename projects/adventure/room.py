@@ -1,6 +1,8 @@
 # Implement a class to hold room information. This should have name and
 # description attributes.
 class Room:
+    # no per-room __dict__, which matters on maps with millions of rooms
+    __slots__ = ("id", "name", "description", "n_to", "s_to", "e_to", "w_to", "x", "y")
     def __init__(self, name, description, id=0, x=None, y=None):
         self.id = id
         self.name = name
@@ -0,0 +1,137 @@
+"""
+Precomputed next-hop table for shortest routes between any two rooms
+"""
+import hashlib
+import os
+from array import array
+
+from replay import DIRECTIONS, transition_table
+
+OPPOSITE = {"n": "s", "s": "n", "e": "w", "w": "e"}
+MAGIC = b"ROUTES1\n"
+
+
+class RouteTable:
+    """
+    For every pair of rooms, the first direction to take on a shortest
+    route from one to the other, packed into two bits.
+
+    Rooms get a dense index in sorted ID order. The row of target room t
+    holds one two-bit direction code (an index into DIRECTIONS) for
+    every room, and component tells which rooms can reach each other at
+    all. Following the codes from any room leads to t in the fewest moves.
+    """
+
+    def __init__(self, room_ids, component, rows):
+        self.room_ids = room_ids
+        self.index = {room_id: i for i, room_id in enumerate(room_ids)}
+        self.component = component
+        self.rows = rows
+        self.row_bytes = (len(room_ids) + 3) // 4
+
+    @classmethod
+    def build(cls, world):
+        """
+        Build the table with one breadth-first search per target room.
+        """
+        room_ids, exits = transition_table(world)
+        num_rooms = len(room_ids)
+        opposite = [DIRECTIONS.index(OPPOSITE[direction]) for direction in DIRECTIONS]
+
+        component = array("q", [-1]) * num_rooms
+        row_bytes = (num_rooms + 3) // 4
+        rows = bytearray(row_bytes * num_rooms)
+        for target in range(num_rooms):
+            base = target * row_bytes
+            seen = bytearray(num_rooms)
+            seen[target] = 1
+            frontier = [target]
+            while len(frontier) > 0:
+                next_frontier = []
+                for current in frontier:
+                    for d in range(4):
+                        neighbor = exits[4 * current + d]
+                        if neighbor >= 0 and not seen[neighbor]:
+                            seen[neighbor] = 1
+                            # from the neighbor, step back toward current
+                            rows[base + (neighbor >> 2)] |= opposite[d] << (2 * (neighbor & 3))
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+            if component[target] < 0:
+                for i in range(num_rooms):
+                    if seen[i]:
+                        component[i] = target
+        return cls(room_ids, component, rows)
+
+    @staticmethod
+    def fingerprint(world):
+        """
+        Hash of the rooms and their exits, used to check a cached table.
+        """
+        digest = hashlib.sha256()
+        for room_id in sorted(world.rooms):
+            room = world.rooms[room_id]
+            exits = ",".join(f"{direction}{room.get_room_in_direction(direction).id}" for direction in room.get_exits())
+            digest.update(f"{room_id}:{exits};".encode())
+        return digest.digest()
+
+    @classmethod
+    def load_or_build(cls, world, cache_file):
+        """
+        Load the table from cache_file if it was saved for this map,
+        otherwise build it and save it there.
+        """
+        fingerprint = cls.fingerprint(world)
+        if os.path.exists(cache_file):
+            with open(cache_file, "rb") as cache:
+                if cache.read(len(MAGIC)) == MAGIC and cache.read(len(fingerprint)) == fingerprint:
+                    room_ids = array("q")
+                    room_ids.fromfile(cache, len(world.rooms))
+                    component = array("q")
+                    component.fromfile(cache, len(world.rooms))
+                    rows = bytearray(cache.read())
+                    return cls(list(room_ids), component, rows)
+        table = cls.build(world)
+        table.save(cache_file, fingerprint)
+        return table
+
+    def save(self, cache_file, fingerprint):
+        with open(cache_file, "wb") as cache:
+            cache.write(MAGIC)
+            cache.write(fingerprint)
+            array("q", self.room_ids).tofile(cache)
+            self.component.tofile(cache)
+            cache.write(self.rows)
+
+    def next_direction(self, from_id, to_id):
+        """
+        Return the first direction on a shortest route between two rooms,
+        or None if they are the same room or not connected.
+        """
+        source = self.index[from_id]
+        target = self.index[to_id]
+        if source == target or self.component[source] != self.component[target]:
+            return None
+        code = self.rows[target * self.row_bytes + (source >> 2)] >> (2 * (source & 3)) & 3
+        return DIRECTIONS[code]
+
+    def route(self, world, from_id, to_id):
+        """
+        Return the list of directions of a shortest route between two
+        rooms, or None if there is no route.
+        """
+        if from_id != to_id and self.next_direction(from_id, to_id) is None:
+            return None
+        directions = []
+        room = world.rooms[from_id]
+        while room.id != to_id:
+            direction = self.next_direction(room.id, to_id)
+            directions.append(direction)
+            room = room.get_room_in_direction(direction)
+        return directions
+
+    def nbytes(self):
+        """
+        Memory held by the table's arrays, in bytes.
+        """
+        return len(self.rows) + self.component.itemsize * len(self.component) + 8 * len(self.room_ids)
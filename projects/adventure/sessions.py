@@ -0,0 +1,133 @@
+"""
+Headless command engine for many player sessions in one World
+"""
+import asyncio
+
+from player import Player
+
+
+class SessionEngine:
+    """
+    Hosts player sessions against one shared World, which it never
+    changes. Commands are the ones of the walk-around loop in adv.py
+    ("n", "s", "e", "w", "q") plus "look", and every command gets a
+    result dictionary instead of printed output.
+
+    Commands submitted while run() is going are queued, and each tick
+    executes everything queued so far as one batch.
+    """
+
+    def __init__(self, world, tick_interval=0.0):
+        self.world = world
+        # extra time to let commands pile up before each batch
+        self.tick_interval = tick_interval
+        self.last_id = 0
+        self.sessions = {}
+        self.pending = []
+        self.running = False
+        self._wakeup = None
+
+    def open_session(self, starting_room=None):
+        """
+        Start a session in starting_room (world.starting_room by default)
+        and return its ID.
+        """
+        self.last_id += 1
+        self.sessions[self.last_id] = Player(starting_room if starting_room is not None else self.world.starting_room)
+        return self.last_id
+
+    def close_session(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def _room_result(self, session_id, command, room):
+        return {
+            "session": session_id,
+            "command": command,
+            "ok": True,
+            "room": room.id,
+            "name": room.name,
+            "description": room.description,
+            "exits": room.get_exits(),
+        }
+
+    def _error_result(self, session_id, command, error):
+        return {"session": session_id, "command": command, "ok": False, "error": error}
+
+    def execute(self, session_id, command):
+        """
+        Run one command for a session and return its result.
+        """
+        player = self.sessions.get(session_id)
+        if player is None:
+            return self._error_result(session_id, command, "There is no such session.")
+        if not isinstance(command, str):
+            return self._error_result(session_id, command, "I did not understand that command.")
+        cmds = command.lower().split(" ")
+        if cmds[0] in ["n", "s", "e", "w"]:
+            next_room = player.current_room.get_room_in_direction(cmds[0])
+            if next_room is None:
+                return self._error_result(session_id, command, "You cannot move in that direction.")
+            player.current_room = next_room
+            return self._room_result(session_id, command, next_room)
+        elif cmds[0] == "look":
+            return self._room_result(session_id, command, player.current_room)
+        elif cmds[0] == "q":
+            self.close_session(session_id)
+            return {"session": session_id, "command": command, "ok": True, "closed": True}
+        else:
+            return self._error_result(session_id, command, "I did not understand that command.")
+
+    def process_batch(self, commands):
+        """
+        Run a list of (session_id, command) pairs in order and return
+        their results. A command that raises gets an error result.
+        """
+        results = []
+        for session_id, command in commands:
+            # one broken command must not stop the batch for everyone else
+            try:
+                results.append(self.execute(session_id, command))
+            except Exception as e:
+                results.append(self._error_result(session_id, command, f"The command failed: {e}"))
+        return results
+
+    def submit(self, session_id, command):
+        """
+        Queue a command for the next tick and return a future for its
+        result. Only valid while run() is going.
+        """
+        if not self.running:
+            raise RuntimeError("The session engine is not running")
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((session_id, command, future))
+        self._wakeup.set()
+        return future
+
+    async def run(self):
+        """
+        Execute queued commands, one batch per tick, until stop().
+        """
+        self._wakeup = asyncio.Event()
+        self.running = True
+        while self.running:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self.tick_interval > 0:
+                await asyncio.sleep(self.tick_interval)
+            batch, self.pending = self.pending, []
+            results = self.process_batch([(session_id, command) for session_id, command, _ in batch])
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stop(self):
+        """
+        Stop run() after the batch in progress. Commands still queued
+        are cancelled.
+        """
+        self.running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+        for _, _, future in self.pending:
+            future.cancel()
+        self.pending = []
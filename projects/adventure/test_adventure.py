@@ -0,0 +1,279 @@
+import unittest
+import asyncio
+import io
+import os
+import tempfile
+from ast import literal_eval
+from contextlib import redirect_stdout
+from world import World
+from map_loader import load_world, convert
+from traversal import plan_traversal, count_visited
+from maze_generator import Maze, maze_records, write_maze
+from viewport import Viewport
+from replay import replay_paths
+from player import Player
+from sessions import SessionEngine
+from load_test import load_test
+
+MAPS = ["maps/test_line.txt", "maps/test_cross.txt", "maps/test_loop.txt", "maps/test_loop_fork.txt", "maps/main_maze.txt"]
+
+# print_rooms output for test_loop_fork.txt before rooms were kept in a sparse grid
+LOOP_FORK_ROOMS = """#####
+#                                        #
+#      017       002       014           #
+#       |         |         |            #
+#       |         |         |            #
+#      016--015--001--012--013           #
+#                 |                      #
+#                 |                      #
+#      008--007--000--003--004           #
+#       |         |                      #
+#       |         |                      #
+#      009       005                     #
+#       |         |                      #
+#       |         |                      #
+#      010--011--006                     #
+#                                        #
+
+#####
+"""
+
+class Test(unittest.TestCase):
+
+    def room_graph(self, world):
+        """
+        Return world in the dict form of the map files.
+        """
+        return {
+            room.id: [(room.x, room.y), {direction: room.get_room_in_direction(direction).id for direction in room.get_exits()}]
+            for room in world.rooms.values()
+        }
+
+    def test_load_world(self):
+        for map_file in MAPS:
+            # connect_rooms links both ways, so compare with the world
+            # load_graph builds from the parsed file, not the file itself
+            with open(map_file, "r") as f:
+                expected = World()
+                expected.load_graph(literal_eval(f.read()))
+            room_graph = self.room_graph(expected)
+            world = load_world(map_file)
+            self.assertDictEqual(self.room_graph(world), room_graph)
+            self.assertIs(world.starting_room, world.rooms[0])
+
+            with tempfile.TemporaryDirectory() as directory:
+                stream_file = os.path.join(directory, "map.rooms")
+                convert(map_file, stream_file)
+                self.assertDictEqual(self.room_graph(load_world(stream_file)), room_graph)
+
+    def test_print_rooms(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            load_world("maps/test_loop_fork.txt").print_rooms()
+        self.assertEqual(output.getvalue(), LOOP_FORK_ROOMS)
+
+        # load_graph and the streaming loader draw the same map
+        with open("maps/main_maze.txt", "r") as f:
+            room_graph = literal_eval(f.read())
+        world = World()
+        world.load_graph(room_graph)
+        expected = io.StringIO()
+        with redirect_stdout(expected):
+            world.print_rooms()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            load_world("maps/main_maze.txt").print_rooms()
+        self.assertEqual(output.getvalue(), expected.getvalue())
+
+    def test_plan_traversal(self):
+        for map_file in MAPS:
+            world = load_world(map_file)
+            for optimized in (False, True):
+                path = plan_traversal(world, optimized=optimized, trials=2, seed=1)
+                self.assertEqual(count_visited(world.starting_room, path), len(world.rooms))
+                self.assertListEqual(plan_traversal(world, optimized=optimized, trials=2, seed=1), path)
+
+        # on a tree the optimized walk ends in the deepest room: twice
+        # the edges minus its depth. Here the deep branch is the first exit.
+        world = World()
+        world.load_graph({
+            0: [(5, 5), {"n": 1, "s": 4, "e": 5}], 1: [(5, 6), {"s": 0, "n": 2}], 2: [(5, 7), {"s": 1, "n": 3}],
+            3: [(5, 8), {"s": 2}], 4: [(5, 4), {"n": 0}], 5: [(6, 5), {"w": 0}]
+        })
+        for seed in range(10):
+            self.assertEqual(len(plan_traversal(world, optimized=True, seed=seed)), 2 * 5 - 3)
+        self.assertEqual(len(plan_traversal(load_world("maps/test_cross.txt"), optimized=True)), 2 * 8 - 2)
+        for seed in range(5):
+            world = World()
+            world.load_rooms(maze_records(200, seed=seed, loop_fraction=0.0))
+            depths = {world.starting_room.id: 0}
+            stack = [world.starting_room]
+            while len(stack) > 0:
+                room = stack.pop()
+                for direction in room.get_exits():
+                    next_room = room.get_room_in_direction(direction)
+                    if next_room.id not in depths:
+                        depths[next_room.id] = depths[room.id] + 1
+                        stack.append(next_room)
+            self.assertEqual(len(plan_traversal(world, optimized=True, seed=seed)), 2 * 199 - max(depths.values()))
+        self.assertLessEqual(len(plan_traversal(load_world("maps/main_maze.txt"), optimized=True, trials=5, seed=1)), 1000)
+
+    def test_route(self):
+        world = load_world("maps/test_loop_fork.txt")
+        rooms = world.rooms
+        self.assertListEqual(world.route(rooms[0], rooms[0]), [])
+        bfs_routes = {(a, b): world.route(rooms[a], rooms[b]) for a in rooms for b in rooms}
+        self.assertListEqual(bfs_routes[(0, 13)], ["n", "e", "e"])
+        self.assertIsNone(world.route_table)
+
+        world.build_route_table()
+        for (a, b), directions in bfs_routes.items():
+            route = world.route(rooms[a], rooms[b])
+            self.assertEqual(len(route), len(directions))
+            room = rooms[a]
+            for direction in route:
+                room = room.get_room_in_direction(direction)
+            self.assertIs(room, rooms[b])
+
+        # reloading drops the table built for the old rooms
+        world.load_graph({0: [(0, 0), {"e": 1}], 1: [(1, 0), {"w": 0}], 2: [(5, 5), {}]})
+        self.assertIsNone(world.route_table)
+        self.assertListEqual(world.route(world.rooms[0], world.rooms[1]), ["e"])
+        self.assertIsNone(world.route(world.rooms[0], world.rooms[2]))
+
+    def test_maze_generator(self):
+        self.assertListEqual(list(maze_records(300, seed=4)), list(maze_records(300, seed=4)))
+        self.assertNotEqual(list(maze_records(300, seed=4)), list(maze_records(300, seed=5)))
+
+        for num_rooms, loop_fraction in ((1, 0.05), (37, 0.0), (500, 0.1)):
+            world = World()
+            world.load_rooms(Maze(num_rooms, seed=2, loop_fraction=loop_fraction).records())
+            self.assertEqual(len(world.rooms), num_rooms)
+            # every room can be reached from the start
+            reached = {world.starting_room}
+            stack = [world.starting_room]
+            while len(stack) > 0:
+                room = stack.pop()
+                for direction in room.get_exits():
+                    next_room = room.get_room_in_direction(direction)
+                    self.assertEqual(abs(next_room.x - room.x) + abs(next_room.y - room.y), 1)
+                    if next_room not in reached:
+                        reached.add(next_room)
+                        stack.append(next_room)
+            self.assertEqual(len(reached), num_rooms)
+            if loop_fraction == 0.0:
+                # a spanning tree has one passage less than it has rooms
+                num_exits = sum(len(room.get_exits()) for room in world.rooms.values())
+                self.assertEqual(num_exits, 2 * (num_rooms - 1))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("maze.txt", "maze.rooms"):
+                map_file = os.path.join(directory, name)
+                write_maze(120, map_file, seed=9)
+                world = World()
+                world.load_rooms(maze_records(120, seed=9))
+                self.assertDictEqual(self.room_graph(load_world(map_file)), self.room_graph(world))
+
+    def test_viewport(self):
+        world = load_world("maps/test_loop_fork.txt")
+        lines = LOOP_FORK_ROOMS.split("\n")
+        viewport = Viewport(world, tile_size=3)
+        # cells 0-7 by rows 7-3 are the whole map, the same lines print_rooms draws
+        self.assertListEqual(viewport.render(4, 5, 8, 5).split("\n")[1:-1], lines[1:-3])
+        window = viewport.render_around(world.rooms[0], width=3, height=3).split("\n")
+        self.assertEqual(window[0], "#" * 17)
+        self.assertEqual(window[5], "#-007--000--003-#")
+        num_tiles = len(viewport.tiles)
+
+        # a changed room only redraws its own tiles and its neighbors'
+        world.rooms[5].connect_rooms("e", world.rooms[4])
+        viewport.invalidate_room(world.rooms[5])
+        self.assertLess(len(viewport.tiles), num_tiles)
+        self.assertIn("005-", viewport.render(4, 5, 8, 5))
+
+        world.load_graph({0: [(0, 0), {"e": 1}], 1: [(1, 0), {"w": 0}]})
+        self.assertEqual(viewport.render(1, 0, 2, 1).split("\n")[2], "# 000--001 #")
+
+    def test_replay_paths(self):
+        world = load_world("maps/test_loop_fork.txt")
+        paths = ["nnss", ["n", "sn", "e"], ["north", "n"], "nxen", "", plan_traversal(world, seed=2)]
+        results = replay_paths(world, paths)
+        self.assertDictEqual(results[1], {"rooms_visited": [0, 1, 12], "num_rooms_visited": 3, "moves": 2, "first_invalid": 1})
+        self.assertDictEqual(results[2], {"rooms_visited": [0, 1], "num_rooms_visited": 2, "moves": 1, "first_invalid": 0})
+        self.assertDictEqual(results[4], {"rooms_visited": [0], "num_rooms_visited": 1, "moves": 0, "first_invalid": None})
+        self.assertSetEqual(set(results[5]["rooms_visited"]), set(world.rooms))
+        for path, result in zip(paths, results):
+            player = Player(world.starting_room)
+            # rooms in the order they were first entered
+            visited = {player.current_room.id: None}
+            first_invalid = None
+            with redirect_stdout(io.StringIO()):
+                for step, move in enumerate(path):
+                    room = player.current_room
+                    player.travel(move)
+                    if player.current_room is room and first_invalid is None:
+                        first_invalid = step
+                    visited.setdefault(player.current_room.id)
+            self.assertListEqual(result["rooms_visited"], list(visited))
+            self.assertEqual(result["num_rooms_visited"], len(visited))
+            self.assertEqual(result["first_invalid"], first_invalid)
+        self.assertListEqual(replay_paths(world, paths, max_workers=2, chunk_size=2), results)
+
+    def test_session_engine(self):
+        world = load_world("maps/test_cross.txt")
+        engine = SessionEngine(world)
+        first = engine.open_session()
+        second = engine.open_session(world.rooms[4])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            results = engine.process_batch([(first, "n"), (second, "e"), (first, "Look"), (second, "jump"), (second, "q"), (second, "w")])
+        self.assertEqual(output.getvalue(), "")
+        self.assertDictEqual(results[0], {
+            "session": first, "command": "n", "ok": True, "room": 1, "name": "Room 1",
+            "description": "(3,6)", "exits": ["n", "s"]
+        })
+        self.assertDictEqual(results[1], {"session": second, "command": "e", "ok": False, "error": "You cannot move in that direction."})
+        self.assertEqual(results[2]["room"], 1)
+        self.assertEqual(results[3]["error"], "I did not understand that command.")
+        self.assertDictEqual(results[4], {"session": second, "command": "q", "ok": True, "closed": True})
+        self.assertEqual(results[5]["error"], "There is no such session.")
+        self.assertIs(world.rooms[0].n_to, world.rooms[1])
+
+        async def play():
+            runner = asyncio.create_task(engine.run())
+            await asyncio.sleep(0)
+            results = await asyncio.gather(engine.submit(first, "n"), engine.submit(first, "s"))
+            engine.stop()
+            await runner
+            return results
+        self.assertListEqual([result["room"] for result in asyncio.run(play())], [2, 1])
+
+        # a broken command only fails itself
+        engine.sessions[first].current_room = None
+        results = engine.process_batch([(first, "n"), (first, None), (second, "look")])
+        self.assertFalse(results[0]["ok"])
+        self.assertEqual(results[1]["error"], "I did not understand that command.")
+        self.assertEqual(results[2]["error"], "There is no such session.")
+        engine.sessions[first].current_room = world.rooms[0]
+
+        async def play_broken():
+            runner = asyncio.create_task(engine.run())
+            await asyncio.sleep(0)
+            broken, session = engine.submit(first, None), engine.open_session()
+            results = await asyncio.gather(broken, engine.submit(first, "n"), engine.submit(session, "e"))
+            engine.stop()
+            await runner
+            return results
+        results = asyncio.run(play_broken())
+        self.assertFalse(results[0]["ok"])
+        self.assertEqual(results[1]["room"], 1)
+        self.assertEqual(results[2]["room"], 3)
+
+        report = asyncio.run(load_test(world, 0, 5))
+        self.assertEqual(report["commands"], 0)
+        self.assertIsNone(report["p99"])
+        self.assertEqual(asyncio.run(load_test(world, 20, 10, seed=1))["commands"], 200)
+        self.assertRaises(RuntimeError, engine.submit, first, "n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Plan a walk through a World that visits every room
+"""
+import random
+
+
+def _path_to_nearest_unvisited(room, visited, rank=None):
+    """
+    Breadth-first search from room to the closest rooms not in visited,
+    returning the directions to get there (None if every room is
+    visited). Among rooms at the same distance the one with the lowest
+    rank(room) is picked, or the first one found without a rank.
+    """
+    # map each reached room to (previous room, direction taken)
+    parents = {room.id: None}
+    frontier = [room]
+    while len(frontier) > 0:
+        candidates = [current_room for current_room in frontier if current_room.id not in visited]
+        if len(candidates) > 0:
+            current_room = candidates[0] if rank is None else min(candidates, key=rank)
+            directions = []
+            while parents[current_room.id] is not None:
+                current_room, direction = parents[current_room.id]
+                directions.append(direction)
+            directions.reverse()
+            return directions
+        next_frontier = []
+        for current_room in frontier:
+            for direction in current_room.get_exits():
+                next_room = current_room.get_room_in_direction(direction)
+                if next_room.id not in parents:
+                    parents[next_room.id] = (current_room, direction)
+                    next_frontier.append(next_room)
+        frontier = next_frontier
+    return None
+
+
+def _branch_heights(starting_room):
+    """
+    Return, for every room, how far the deepest room below it is in a
+    breadth-first spanning tree rooted at starting_room.
+    """
+    order = [starting_room]
+    parents = {starting_room.id: None}
+    i = 0
+    while i < len(order):
+        room = order[i]
+        i += 1
+        for direction in room.get_exits():
+            next_room = room.get_room_in_direction(direction)
+            if next_room.id not in parents:
+                parents[next_room.id] = room
+                order.append(next_room)
+
+    heights = {room.id: 0 for room in order}
+    for room in reversed(order):
+        parent = parents[room.id]
+        if parent is not None:
+            heights[parent.id] = max(heights[parent.id], heights[room.id] + 1)
+    return heights
+
+
+def _walk(starting_room, num_rooms, choose, rank=None):
+    """
+    Depth-first walk: step into an unvisited neighbor picked by choose
+    while there is one, otherwise go to the nearest unvisited room
+    (the one with the lowest rank among equally near ones).
+    """
+    path = []
+    room = starting_room
+    visited = {room.id}
+    while len(visited) < num_rooms:
+        options = [
+            direction for direction in room.get_exits()
+            if room.get_room_in_direction(direction).id not in visited
+        ]
+        if len(options) > 0:
+            steps = [choose(room, options)]
+        else:
+            steps = _path_to_nearest_unvisited(room, visited, rank)
+            if steps is None:
+                break
+        for direction in steps:
+            room = room.get_room_in_direction(direction)
+            visited.add(room.id)
+            path.append(direction)
+    return path
+
+
+def plan_traversal(world, starting_room=None, optimized=False, trials=1, seed=None):
+    """
+    Return a list of directions that visits every room reachable from
+    starting_room (world.starting_room by default).
+
+    The plain mode walks depth-first, picking unexplored exits at random,
+    and backtracks to the nearest unexplored room with a breadth-first
+    search. optimized=True ranks rooms by the height of the branch below
+    them and always enters the lowest branch first, both when stepping
+    into a neighbor and when backtracking, so the deepest branch is
+    entered last and never walked back out of. On a tree maze that is
+    the shortest possible walk (twice the edges minus the depth of the
+    deepest room). On a maze with loops it is only a heuristic: the
+    heights come from a breadth-first spanning tree and loops are only
+    used as shortcuts by the backtracking search. Each trial breaks ties
+    differently and the shortest walk is kept.
+    """
+    if starting_room is None:
+        starting_room = world.starting_room
+    rng = random.Random(seed)
+    num_rooms = len(world.rooms)
+    heights = _branch_heights(starting_room) if optimized else None
+
+    def rank(room):
+        # a random tie-break between branches of the same height
+        return (heights[room.id], rng.random())
+
+    def choose(room, options):
+        if heights is None:
+            return rng.choice(options)
+        return min(options, key=lambda direction: rank(room.get_room_in_direction(direction)))
+
+    best = None
+    for _ in range(trials):
+        path = _walk(starting_room, num_rooms, choose, rank if optimized else None)
+        if best is None or len(path) < len(best):
+            best = path
+    return best
+
+
+def count_visited(starting_room, path):
+    """
+    Return how many distinct rooms walking path from starting_room visits.
+    """
+    room = starting_room
+    visited = {room.id}
+    for direction in path:
+        room = room.get_room_in_direction(direction)
+        visited.add(room.id)
+    return len(visited)
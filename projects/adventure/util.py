@@ -0,0 +1,10 @@
+# The Queue and Stack classes are shared by every project and live in
+# projects/structures.py, this module only makes them importable from here.
+import os
+import sys
+
+_projects_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _projects_dir not in sys.path:
+    sys.path.append(_projects_dir)
+
+from structures import Queue, Stack  # noqa: E402
@@ -0,0 +1,87 @@
+"""
+Draw the part of a World around a point, from cached tiles
+"""
+from world import render_row
+
+
+class Viewport:
+    """
+    Renders windows of a world's map in the print_rooms style.
+
+    The grid is cut into square tiles of tile_size cells. A tile is
+    drawn the first time a window touches it and kept until
+    invalidate() or invalidate_room() drops it, or the world loads new
+    rooms, so the cost of a window depends on its size, not on the size
+    of the map.
+    """
+
+    def __init__(self, world, tile_size=16):
+        self.world = world
+        self.tile_size = tile_size
+        # the grid the tiles were drawn from
+        self.room_grid = world.room_grid
+        # (tile x, tile y) -> list of text lines, top line first
+        self.tiles = {}
+
+    def _tile(self, tile_x, tile_y):
+        key = (tile_x, tile_y)
+        if key not in self.tiles:
+            size = self.tile_size
+            x_min = tile_x * size
+            lines = []
+            for y in range(tile_y * size + size - 1, tile_y * size - 1, -1):
+                lines.extend(render_row(self.room_grid.row(y), x_min, x_min + size - 1))
+            self.tiles[key] = lines
+        return self.tiles[key]
+
+    def render(self, x, y, width, height):
+        """
+        Return the text drawing of the width x height cells centered on
+        (x, y), framed like print_rooms.
+        """
+        if self.world.room_grid is not self.room_grid:
+            # load_rooms replaced the grid, so every tile is stale
+            self.room_grid = self.world.room_grid
+            self.tiles = {}
+        size = self.tile_size
+        x_min = x - width // 2
+        y_max = y + height // 2
+        lines = []
+        for row_y in range(y_max, y_max - height, -1):
+            tile_y, row_in_tile = divmod(row_y, size)
+            # rows are stored top first inside a tile
+            offset = 3 * (size - 1 - row_in_tile)
+            for part in range(3):
+                pieces = []
+                cell_x = x_min
+                while cell_x < x_min + width:
+                    tile_x, column = divmod(cell_x, size)
+                    count = min(size - column, x_min + width - cell_x)
+                    line = self._tile(tile_x, tile_y)[offset + part]
+                    pieces.append(line[5 * column:5 * (column + count)])
+                    cell_x += count
+                lines.append("#" + "".join(pieces) + "#")
+        border = "#" * (5 * width + 2)
+        return "\n".join([border] + lines + [border])
+
+    def render_around(self, room, width=11, height=7):
+        """
+        Return the window of width x height cells centered on room.
+        """
+        return self.render(room.x, room.y, width, height)
+
+    def invalidate(self, x, y):
+        """
+        Forget the drawn tile that contains (x, y).
+        """
+        self.tiles.pop((x // self.tile_size, y // self.tile_size), None)
+
+    def invalidate_room(self, room):
+        """
+        Forget the drawn tiles of room and of the rooms it connects to,
+        after its exits changed.
+        """
+        self.invalidate(room.x, room.y)
+        for direction in room.get_exits():
+            other = room.get_room_in_direction(direction)
+            self.invalidate(other.x, other.y)
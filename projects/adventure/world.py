@@ -1,89 +1,159 @@
 from room import Room
+from routes import RouteTable
+from util import Queue
+from bisect import bisect_left, bisect_right, insort
 import random
 import math
 
+
+class RoomGrid:
+    """
+    Sparse store of rooms by coordinates: only rows that contain rooms
+    exist, and each maps x to the room at (x, y).
+    """
+    def __init__(self):
+        self.rows = {}
+        # the y of every row, kept sorted for range iteration
+        self.row_keys = []
+
+    def add(self, room):
+        if room.y not in self.rows:
+            self.rows[room.y] = {}
+            insort(self.row_keys, room.y)
+        self.rows[room.y][room.x] = room
+
+    def row(self, y):
+        """
+        Return the x -> room mapping of row y, empty if it has no rooms.
+        """
+        return self.rows.get(y, {})
+
+    def get(self, x, y):
+        row = self.rows.get(y)
+        if row is None:
+            return None
+        return row.get(x)
+
+    def iter_rows(self, y_min, y_max):
+        """
+        Yield (y, row) for the rows with y_min <= y <= y_max, from the
+        top (largest y) down, the order they are drawn in.
+        """
+        start = bisect_left(self.row_keys, y_min)
+        stop = bisect_right(self.row_keys, y_max)
+        for i in range(stop - 1, start - 1, -1):
+            y = self.row_keys[i]
+            yield y, self.rows[y]
+
+
+def render_row(row, x_min, x_max):
+    """
+    Return the three text lines (north connections, rooms, south
+    connections) that draw cells x_min..x_max of one grid row.
+    """
+    north = []
+    middle = []
+    south = []
+    for x in range(x_min, x_max + 1):
+        room = row.get(x)
+        if room is None:
+            north.append("     ")
+            middle.append("     ")
+            south.append("     ")
+            continue
+        north.append("  |  " if room.n_to is not None else "     ")
+        middle.append(("-" if room.w_to is not None else " ") + f"{room.id}".zfill(3) + ("-" if room.e_to is not None else " "))
+        south.append("  |  " if room.s_to is not None else "     ")
+    return "".join(north), "".join(middle), "".join(south)
+
+
 class World:
     def __init__(self):
         self.starting_room = None
         self.rooms = {}
-        self.room_grid = []
+        self.room_grid = RoomGrid()
         self.grid_size = 0
+        self.route_table = None
     def load_graph(self, room_graph):
-        num_rooms = len(room_graph)
-        rooms = [None] * num_rooms
+        self.load_rooms((room_id, coords[0], coords[1], exits) for room_id, (coords, exits) in room_graph.items())
+
+    def load_rooms(self, records):
+        """
+        Fill the world from an iterable of (room_id, x, y, exits) records,
+        where exits maps directions to room IDs. Records are consumed one
+        at a time, so they can be streamed straight from a map file.
+        """
+        self.rooms = {}
+        # a route table built for the previous rooms no longer applies
+        self.route_table = None
+        # exits that point at rooms not created yet, by target room ID
+        pending = {}
         grid_size = 1
-        for i in range(0, num_rooms):
-            x = room_graph[i][0][0]
-            grid_size = max(grid_size, room_graph[i][0][0], room_graph[i][0][1])
-            self.rooms[i] = Room(f"Room {i}", f"({room_graph[i][0][0]},{room_graph[i][0][1]})",i, room_graph[i][0][0], room_graph[i][0][1])
-        self.room_grid = []
-        grid_size += 1
-        self.grid_size = grid_size
-        for i in range(0, grid_size):
-            self.room_grid.append([None] * grid_size)
-        for room_id in room_graph:
-            room = self.rooms[room_id]
-            self.room_grid[room.x][room.y] = room
-            if 'n' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('n', self.rooms[room_graph[room_id][1]['n']])
-            if 's' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('s', self.rooms[room_graph[room_id][1]['s']])
-            if 'e' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('e', self.rooms[room_graph[room_id][1]['e']])
-            if 'w' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('w', self.rooms[room_graph[room_id][1]['w']])
+        for room_id, x, y, exits in records:
+            grid_size = max(grid_size, x, y)
+            room = Room(f"Room {room_id}", f"({x},{y})", room_id, x, y)
+            self.rooms[room_id] = room
+            for direction, target_id in exits.items():
+                if target_id in self.rooms:
+                    room.connect_rooms(direction, self.rooms[target_id])
+                else:
+                    pending.setdefault(target_id, []).append((room, direction))
+            for other_room, direction in pending.pop(room_id, ()):
+                other_room.connect_rooms(direction, room)
+        if len(pending) > 0:
+            raise ValueError(f"Exits lead to missing rooms: {sorted(pending)[:10]}")
+
+        self.room_grid = RoomGrid()
+        self.grid_size = grid_size + 1
+        for room in self.rooms.values():
+            self.room_grid.add(room)
         self.starting_room = self.rooms[0]
 
+    def build_route_table(self, cache_file=None):
+        """
+        Precompute the next move on a shortest route between every pair
+        of rooms, loading it from cache_file when it was saved for this map.
+        """
+        if cache_file is None:
+            self.route_table = RouteTable.build(self)
+        else:
+            self.route_table = RouteTable.load_or_build(self, cache_file)
+        return self.route_table
+
+    def route(self, from_room, to_room):
+        """
+        Return the directions of a shortest route between two rooms, or
+        None if there is none. Looks the route up in the route table if
+        build_route_table was called, otherwise runs one breadth-first
+        search, since the table takes O(rooms ** 2) time and space.
+        """
+        if self.route_table is not None:
+            return self.route_table.route(self, from_room.id, to_room.id)
+        # map each reached room to (previous room, direction taken)
+        parents = {from_room.id: None}
+        queue = Queue()
+        queue.enqueue(from_room)
+        while queue.size() > 0:
+            room = queue.dequeue()
+            if room is to_room:
+                directions = []
+                while parents[room.id] is not None:
+                    room, direction = parents[room.id]
+                    directions.append(direction)
+                directions.reverse()
+                return directions
+            for direction in room.get_exits():
+                next_room = room.get_room_in_direction(direction)
+                if next_room.id not in parents:
+                    parents[next_room.id] = (room, direction)
+                    queue.enqueue(next_room)
+        return None
+
     def print_rooms(self):
-        rotated_room_grid = []
-        for i in range(0, len(self.room_grid)):
-            rotated_room_grid.append([None] * len(self.room_grid))
-        for i in range(len(self.room_grid)):
-            for j in range(len(self.room_grid[0])):
-                rotated_room_grid[len(self.room_grid[0]) - j - 1][i] = self.room_grid[i][j]
+        # draw one grid row at a time, top row first, skipping empty rows
         print("#####")
-        str = ""
-        for row in rotated_room_grid:
-            all_null = True
-            for room in row:
-                if room is not None:
-                    all_null = False
-                    break
-            if all_null:
-                continue
-            # PRINT NORTH CONNECTION ROW
-            str += "#"
-            for room in row:
-                if room is not None and room.n_to is not None:
-                    str += "  |  "
-                else:
-                    str += "     "
-            str += "#\n"
-            # PRINT ROOM ROW
-            str += "#"
-            for room in row:
-                if room is not None and room.w_to is not None:
-                    str += "-"
-                else:
-                    str += " "
-                if room is not None:
-                    str += f"{room.id}".zfill(3)
-                else:
-                    str += "   "
-                if room is not None and room.e_to is not None:
-                    str += "-"
-                else:
-                    str += " "
-            str += "#\n"
-            # PRINT SOUTH CONNECTION ROW
-            str += "#"
-            for room in row:
-                if room is not None and room.s_to is not None:
-                    str += "  |  "
-                else:
-                    str += "     "
-            str += "#\n"
-        print(str)
+        for y, row in self.room_grid.iter_rows(0, self.grid_size - 1):
+            for line in render_row(row, 0, self.grid_size - 1):
+                print(f"#{line}#")
+        print()
         print("#####")
-
-
@@ -1,4 +1,4 @@
-from util import Stack
+from util import Stack, Queue
 
 
 def earliest_ancestor(ancestors, starting_node):
@@ -43,3 +43,109 @@ def create_graph(ancestors):
             ancestors_dict[child] = set()
             ancestors_dict[child].add(parent)
     return ancestors_dict
+
+
+class AncestryIndex:
+    """
+    Answers earliest_ancestor queries in O(1) after a single O(V + E)
+    pass over the (parent, child) pairs. New pairs can be added later
+    with add_pair without rebuilding.
+
+    For every individual it stores (depth, ancestor): the farthest
+    ancestor and how many generations away it is, ties going to the
+    lowest ID. An individual without parents is its own ancestor at
+    depth 0.
+
+    When lines of descent split and meet again, the depth is always the
+    longest line. earliest_ancestor only follows the first line its
+    search reaches each individual by, so there it can return a nearer
+    ancestor than this index does.
+    """
+
+    def __init__(self, ancestors):
+        self.parents = create_graph(ancestors)
+        self.children = {}
+        for child, parents in self.parents.items():
+            for parent in parents:
+                self.children.setdefault(parent, set()).add(child)
+        self.earliest = {}
+        self._build()
+
+    def _build(self):
+        # topological pass from the individuals without parents
+        pending = {child: len(parents) for child, parents in self.parents.items()}
+        queue = Queue()
+        for node in self.children:
+            if node not in self.parents:
+                self.earliest[node] = (0, node)
+                queue.enqueue(node)
+
+        processed = 0
+        while queue.size() > 0:
+            node = queue.dequeue()
+            processed += 1
+            for child in self.children.get(node, ()):
+                self._offer(child, node)
+                pending[child] -= 1
+                if pending[child] == 0:
+                    queue.enqueue(child)
+
+        # individuals on a cycle never run out of pending parents
+        if processed < len(self.parents.keys() | self.children.keys()):
+            raise ValueError("ancestors contain a cycle")
+
+    def _offer(self, child, parent):
+        # the parent's earliest ancestor is one generation farther from child
+        depth, ancestor = self.earliest[parent]
+        candidate = (depth + 1, ancestor)
+        current = self.earliest.get(child)
+        if current is None or candidate[0] > current[0] or (candidate[0] == current[0] and ancestor < current[1]):
+            self.earliest[child] = candidate
+            return True
+        return False
+
+    def add_pair(self, parent, child):
+        """
+        Add one (parent, child) pair and update the cached answers of
+        the child and only those descendants whose answer changes.
+
+        Raises ValueError, leaving the index untouched, if the pair
+        would make someone their own ancestor.
+        """
+        if child in self.parents and parent in self.parents[child]:
+            return
+
+        # a cycle appears only if child is already an ancestor of parent
+        stack = Stack()
+        stack.push(parent)
+        visited = set()
+        while stack.size() > 0:
+            node = stack.pop()
+            if node == child:
+                raise ValueError(f"{child} is an ancestor of {parent}, the pair would create a cycle")
+            if node not in visited:
+                visited.add(node)
+                stack.extend(self.parents.get(node, ()))
+
+        self.parents.setdefault(child, set()).add(parent)
+        self.children.setdefault(parent, set()).add(child)
+        self.earliest.setdefault(parent, (0, parent))
+
+        # adding a parent can only move an answer farther back, so stop
+        # walking down as soon as a descendant's answer stays the same
+        if not self._offer(child, parent):
+            return
+        queue = Queue()
+        queue.enqueue(child)
+        while queue.size() > 0:
+            node = queue.dequeue()
+            for grandchild in self.children.get(node, ()):
+                if self._offer(grandchild, node):
+                    queue.enqueue(grandchild)
+
+    def earliest_ancestor(self, starting_node):
+        depth, ancestor = self.earliest.get(starting_node, (0, starting_node))
+        if depth == 0:
+            return -1
+        else:
+            return ancestor
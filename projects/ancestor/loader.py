@@ -0,0 +1,152 @@
+from array import array
+from itertools import islice
+
+from util import Queue
+
+
+def iter_pairs(source):
+    """
+    Yield (parent, child) integer pairs from a file path or an iterable.
+
+    Lines of a file may separate the two IDs with a comma or whitespace.
+    Blank lines are skipped, and so is the first line if it is not two
+    integers (a CSV header); any other line that is not two integers
+    raises ValueError with its line number.
+    """
+    if not isinstance(source, str):
+        for parent, child in source:
+            yield int(parent), int(child)
+        return
+
+    with open(source, "r") as pairs_file:
+        for line_number, line in enumerate(pairs_file, 1):
+            fields = line.replace(",", " ").split()
+            if len(fields) == 0:
+                continue
+            try:
+                if len(fields) != 2:
+                    raise ValueError
+                pair = int(fields[0]), int(fields[1])
+            except ValueError:
+                if line_number == 1:
+                    continue
+                raise ValueError(f"{source}, line {line_number}: expected two integer IDs, got {line.strip()!r}") from None
+            yield pair
+
+
+def _csr(num_nodes, sources, targets):
+    # group targets by source with a counting sort
+    offsets = array("q", bytes(8 * (num_nodes + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+    values = array("q", bytes(8 * len(targets)))
+    fill = array("q", offsets)
+    for source, target in zip(sources, targets):
+        values[fill[source]] = target
+        fill[source] += 1
+    return offsets, values
+
+
+class CompactAncestry:
+    """
+    Ancestor data held in flat integer arrays instead of a list of tuples.
+
+    Every individual gets a dense index; ids maps it back to their ID.
+    The parents of the individual at index i are
+    parents[parent_offsets[i]:parent_offsets[i + 1]] and the children
+    are stored the same way.
+    """
+
+    def __init__(self, ids, children, parents):
+        self.ids = ids
+        self.index = {node: i for i, node in enumerate(ids)}
+        self.child_offsets, self.children = _csr(len(ids), parents, children)
+        self.parent_offsets, self.parents = _csr(len(ids), children, parents)
+        self._build_earliest()
+
+    @classmethod
+    def load(cls, source, chunk_size=65536):
+        """
+        Stream (parent, child) pairs from a file path or an iterable in
+        chunks of chunk_size, so the pairs never exist as a Python list.
+        """
+        ids = array("q")
+        index = {}
+        parents = array("q")
+        children = array("q")
+        pairs = iter_pairs(source)
+        while True:
+            chunk = array("q")
+            for parent, child in islice(pairs, chunk_size):
+                for node in (parent, child):
+                    if node not in index:
+                        index[node] = len(ids)
+                        ids.append(node)
+                    chunk.append(index[node])
+            if len(chunk) == 0:
+                break
+            parents.extend(chunk[0::2])
+            children.extend(chunk[1::2])
+        return cls(ids, children, parents)
+
+    def _build_earliest(self):
+        # topological pass from the individuals without parents, keeping
+        # the farthest ancestor of everyone (lowest ID on ties)
+        num_nodes = len(self.ids)
+        self.depth = array("q", bytes(8 * num_nodes))
+        self.earliest = array("q", range(num_nodes))
+        pending = array("q", (self.parent_offsets[i + 1] - self.parent_offsets[i] for i in range(num_nodes)))
+        queue = Queue()
+        queue.extend(i for i in range(num_nodes) if pending[i] == 0)
+        processed = 0
+        ids = self.ids
+        while queue.size() > 0:
+            node = queue.dequeue()
+            processed += 1
+            depth = self.depth[node] + 1
+            ancestor = self.earliest[node]
+            for child in self.children[self.child_offsets[node]:self.child_offsets[node + 1]]:
+                if depth > self.depth[child] or (depth == self.depth[child] and ids[ancestor] < ids[self.earliest[child]]):
+                    self.depth[child] = depth
+                    self.earliest[child] = ancestor
+                pending[child] -= 1
+                if pending[child] == 0:
+                    queue.enqueue(child)
+        if processed < num_nodes:
+            raise ValueError("ancestors contain a cycle")
+
+    def get_parents(self, node):
+        if node not in self.index:
+            return []
+        i = self.index[node]
+        return [self.ids[parent] for parent in self.parents[self.parent_offsets[i]:self.parent_offsets[i + 1]]]
+
+    def earliest_ancestor(self, starting_node):
+        if starting_node not in self.index:
+            return -1
+        i = self.index[starting_node]
+        if self.depth[i] == 0:
+            return -1
+        else:
+            return self.ids[self.earliest[i]]
+
+    def is_ancestor(self, x, y):
+        """
+        Return True if x is an ancestor of y, searching up from y.
+        """
+        if x not in self.index or y not in self.index or x == y:
+            return False
+        target = self.index[x]
+        start = self.index[y]
+        stack = list(self.parents[self.parent_offsets[start]:self.parent_offsets[start + 1]])
+        visited = set()
+        while len(stack) > 0:
+            node = stack.pop()
+            if node == target:
+                return True
+            if node not in visited:
+                visited.add(node)
+                stack.extend(self.parents[self.parent_offsets[node]:self.parent_offsets[node + 1]])
+        return False
@@ -0,0 +1,168 @@
+from util import Queue
+
+
+class AncestorQueries:
+    """
+    Preprocessed "is X an ancestor of Y" and common ancestor queries
+    over the child -> parents dictionary built by create_graph.
+
+    Individuals whose whole ancestry is a single line (every ancestor
+    has at most one parent) get binary lifting tables, so their queries
+    take O(log depth). Everyone else gets a bitset of all their
+    ancestors, one bit per individual, so membership is O(1).
+
+    Ancestors here are proper ancestors: nobody is their own ancestor.
+    """
+
+    def __init__(self, ancestors_graph):
+        self.parents = ancestors_graph
+        children = {}
+        for child, parents in ancestors_graph.items():
+            for parent in parents:
+                children.setdefault(parent, set()).add(child)
+
+        # topological order, every parent before its children
+        pending = {child: len(parents) for child, parents in ancestors_graph.items()}
+        self.order = [node for node in children if node not in ancestors_graph]
+        queue = Queue()
+        queue.extend(self.order)
+        while queue.size() > 0:
+            node = queue.dequeue()
+            for child in children.get(node, ()):
+                pending[child] -= 1
+                if pending[child] == 0:
+                    self.order.append(child)
+                    queue.enqueue(child)
+        if len(self.order) < len(pending) + len(children.keys() - pending.keys()):
+            raise ValueError("ancestors contain a cycle")
+        self.bit = {node: i for i, node in enumerate(self.order)}
+
+        # depth and jump tables for single-line individuals, where
+        # up[node][k] is the ancestor 2**k generations up
+        self.depth = {}
+        self.up = {}
+        # ancestor bitsets, filled up front for everyone else and on
+        # demand for single-line individuals
+        self.ancestor_bits = {}
+        for node in self.order:
+            parents = ancestors_graph.get(node, ())
+            if len(parents) == 0:
+                self.depth[node] = 0
+                self.up[node] = []
+            elif len(parents) == 1 and next(iter(parents)) in self.up:
+                parent = next(iter(parents))
+                self.depth[node] = self.depth[parent] + 1
+                # 2**(k + 1) generations up is 2**k up from 2**k up
+                jumps = [parent]
+                while len(jumps) - 1 < len(self.up[jumps[-1]]):
+                    jumps.append(self.up[jumps[-1]][len(jumps) - 1])
+                self.up[node] = jumps
+            else:
+                bits = 0
+                for parent in parents:
+                    bits |= 1 << self.bit[parent] | self._bits(parent)
+                self.ancestor_bits[node] = bits
+
+    def _bits(self, node):
+        """
+        Return the ancestor bitset of node, building and caching it for
+        single-line individuals by walking up to the nearest cached one.
+        """
+        if node in self.ancestor_bits:
+            return self.ancestor_bits[node]
+        if node not in self.up:
+            return 0
+
+        line = [node]
+        while len(self.up[line[-1]]) > 0 and self.up[line[-1]][0] not in self.ancestor_bits:
+            line.append(self.up[line[-1]][0])
+        top = line[-1]
+        bits = 0
+        if len(self.up[top]) > 0:
+            parent = self.up[top][0]
+            bits = 1 << self.bit[parent] | self.ancestor_bits[parent]
+        for member in reversed(line):
+            self.ancestor_bits[member] = bits
+            bits |= 1 << self.bit[member]
+        return self.ancestor_bits[node]
+
+    def _lift(self, node, generations):
+        # climb the given number of generations in O(log generations)
+        k = 0
+        while generations > 0:
+            if generations & 1:
+                node = self.up[node][k]
+            generations >>= 1
+            k += 1
+        return node
+
+    def _line_meet(self, x, y):
+        # the deepest individual that is x or y or an ancestor of both
+        if self.depth[x] < self.depth[y]:
+            x, y = y, x
+        x = self._lift(x, self.depth[x] - self.depth[y])
+        if x == y:
+            return x
+        for k in range(len(self.up[x]) - 1, -1, -1):
+            if k < len(self.up[x]) and k < len(self.up[y]) and self.up[x][k] != self.up[y][k]:
+                x = self.up[x][k]
+                y = self.up[y][k]
+        if len(self.up[x]) == 0 or len(self.up[y]) == 0 or self.up[x][0] != self.up[y][0]:
+            return None
+        return self.up[x][0]
+
+    def _decode(self, bits):
+        nodes = set()
+        while bits:
+            lowest = bits & -bits
+            nodes.add(self.order[lowest.bit_length() - 1])
+            bits ^= lowest
+        return nodes
+
+    def is_ancestor(self, x, y):
+        """
+        Return True if x is an ancestor of y.
+        """
+        if x == y or x not in self.bit or y not in self.bit:
+            return False
+        if y in self.up:
+            # a single-line individual only has single-line ancestors
+            if x not in self.up or self.depth[x] >= self.depth[y]:
+                return False
+            return self._lift(y, self.depth[y] - self.depth[x]) == x
+        return self.ancestor_bits[y] >> self.bit[x] & 1 == 1
+
+    def ancestors(self, node):
+        """
+        Return the set of all ancestors of node.
+        """
+        return self._decode(self._bits(node))
+
+    def common_ancestors(self, x, y):
+        """
+        Return the set of individuals that are ancestors of both x and y.
+        """
+        return self._decode(self._bits(x) & self._bits(y))
+
+    def lowest_common_ancestors(self, x, y):
+        """
+        Return the common ancestors of x and y that are not an ancestor
+        of another common ancestor. On single lines this is at most one
+        individual.
+        """
+        if x in self.up and y in self.up:
+            meet = self._line_meet(x, y)
+            if meet is None:
+                return set()
+            if meet == x or meet == y:
+                # one is the other's ancestor, go one generation higher
+                if len(self.up[meet]) == 0:
+                    return set()
+                meet = self.up[meet][0]
+            return {meet}
+
+        common = self._bits(x) & self._bits(y)
+        covered = 0
+        for node in self._decode(common):
+            covered |= self._bits(node)
+        return self._decode(common & ~covered)
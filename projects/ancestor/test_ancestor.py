@@ -1,5 +1,9 @@
 import unittest
-from ancestor import earliest_ancestor
+import os
+import tempfile
+from ancestor import earliest_ancestor, AncestryIndex, create_graph
+from queries import AncestorQueries
+from loader import CompactAncestry
 
 class Test(unittest.TestCase):
 
@@ -26,5 +30,75 @@ class Test(unittest.TestCase):
         self.assertEqual(earliest_ancestor(test_ancestors, 10), -1)
         self.assertEqual(earliest_ancestor(test_ancestors, 11), -1)
 
+    def test_ancestry_index(self):
+        test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), (5, 7), (4, 5), (4, 8), (8, 9), (11, 8), (10, 1)]
+        index = AncestryIndex(test_ancestors)
+        for node in range(1, 13):
+            self.assertEqual(index.earliest_ancestor(node), earliest_ancestor(test_ancestors, node))
+        self.assertRaises(ValueError, AncestryIndex, [(1, 2), (2, 3), (3, 1)])
+
+        # 6 descends from 2 along 2-3-4-6, which is deeper than 1-5-6
+        reconverging = [(2, 3), (2, 6), (3, 4), (4, 6), (1, 5), (5, 6), (2, 5)]
+        self.assertEqual(AncestryIndex(reconverging).earliest_ancestor(6), 2)
+
+    def test_ancestry_index_add_pair(self):
+        test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), (5, 7), (4, 5), (4, 8), (8, 9), (11, 8), (10, 1)]
+        index = AncestryIndex(test_ancestors[:4])
+        for pair in test_ancestors[4:]:
+            index.add_pair(*pair)
+        for node in range(1, 13):
+            self.assertEqual(index.earliest_ancestor(node), earliest_ancestor(test_ancestors, node))
+
+        index.add_pair(12, 10)
+        self.assertEqual(index.earliest_ancestor(6), 12)
+        self.assertEqual(index.earliest_ancestor(9), 4)
+        self.assertRaises(ValueError, index.add_pair, 6, 12)
+        self.assertEqual(index.earliest_ancestor(12), -1)
+
+    def test_ancestor_queries(self):
+        test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), (5, 7), (4, 5), (4, 8), (8, 9), (11, 8), (10, 1)]
+        queries = AncestorQueries(create_graph(test_ancestors))
+        self.assertTrue(queries.is_ancestor(10, 6))
+        self.assertTrue(queries.is_ancestor(10, 3))
+        self.assertTrue(queries.is_ancestor(4, 9))
+        self.assertFalse(queries.is_ancestor(6, 10))
+        self.assertFalse(queries.is_ancestor(2, 7))
+        self.assertFalse(queries.is_ancestor(5, 5))
+        self.assertSetEqual(queries.ancestors(6), {1, 2, 3, 4, 5, 10})
+        self.assertSetEqual(queries.common_ancestors(6, 7), {4, 5})
+        self.assertSetEqual(queries.lowest_common_ancestors(6, 7), {5})
+        self.assertSetEqual(queries.lowest_common_ancestors(7, 9), {4})
+        self.assertSetEqual(queries.lowest_common_ancestors(1, 3), {10})
+        self.assertSetEqual(queries.lowest_common_ancestors(2, 9), set())
+
+    def test_compact_ancestry(self):
+        test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), (5, 7), (4, 5), (4, 8), (8, 9), (11, 8), (10, 1)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pairs.csv")
+            with open(path, "w") as pairs_file:
+                pairs_file.write("parent,child\n")
+                for parent, child in test_ancestors:
+                    pairs_file.write(f"{parent},{child}\n")
+            compact = CompactAncestry.load(path, chunk_size=3)
+
+        for node in range(1, 13):
+            self.assertEqual(compact.earliest_ancestor(node), earliest_ancestor(test_ancestors, node))
+        self.assertListEqual(sorted(compact.get_parents(3)), [1, 2])
+        self.assertTrue(compact.is_ancestor(10, 6))
+        self.assertFalse(compact.is_ancestor(6, 10))
+        self.assertEqual(CompactAncestry.load(iter(test_ancestors)).earliest_ancestor(9), 4)
+
+    def test_compact_ancestry_bad_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pairs.csv")
+            with open(path, "w") as pairs_file:
+                pairs_file.write("parent,child\n1,3\n\n2 3\n")
+            self.assertEqual(CompactAncestry.load(path).earliest_ancestor(3), 1)
+
+            with open(path, "w") as pairs_file:
+                pairs_file.write("parent,child\n1,3\n2;3\n")
+            with self.assertRaisesRegex(ValueError, "line 3"):
+                CompactAncestry.load(path)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+"""
+Microbenchmark the shared deque-backed Queue and Stack against the
+list-backed classes every project used to carry in its util.py.
+
+Run with: python bench_structures.py [--all]
+
+The old Queue dequeues with list.pop(0), which moves every remaining
+element, so by default it is skipped above 10^5 elements. Pass --all to
+time it at every size.
+"""
+import sys
+import time
+
+from structures import Queue, Stack
+
+
+class ListQueue():
+    # the previous util.Queue
+    def __init__(self):
+        self.queue = []
+    def enqueue(self, value):
+        self.queue.append(value)
+    def dequeue(self):
+        if self.size() > 0:
+            return self.queue.pop(0)
+        else:
+            return None
+    def size(self):
+        return len(self.queue)
+
+
+class ListStack():
+    # the previous util.Stack
+    def __init__(self):
+        self.stack = []
+    def push(self, value):
+        self.stack.append(value)
+    def pop(self):
+        if self.size() > 0:
+            return self.stack.pop()
+        else:
+            return None
+    def size(self):
+        return len(self.stack)
+
+
+def time_queue(queue_class, n, bulk=False):
+    start = time.perf_counter()
+    queue = queue_class()
+    if bulk:
+        queue.extend(range(n))
+    else:
+        for i in range(n):
+            queue.enqueue(i)
+    while queue.size() > 0:
+        queue.dequeue()
+    return time.perf_counter() - start
+
+
+def time_stack(stack_class, n, bulk=False):
+    start = time.perf_counter()
+    stack = stack_class()
+    if bulk:
+        stack.extend(range(n))
+    else:
+        for i in range(n):
+            stack.push(i)
+    while stack.size() > 0:
+        stack.pop()
+    return time.perf_counter() - start
+
+
+def main(run_all=False):
+    list_queue_limit = None if run_all else 10 ** 5
+    print(f"{'elements':>9} {'list Queue':>11} {'Queue':>9} {'Queue.extend':>13}"
+          f" {'list Stack':>11} {'Stack':>9} {'Stack.extend':>13}")
+    for exponent in range(3, 7):
+        n = 10 ** exponent
+        if list_queue_limit is None or n <= list_queue_limit:
+            old_queue = f"{time_queue(ListQueue, n):>10.4f}s"
+        else:
+            old_queue = f"{'skipped':>11}"
+        print(f"{n:>9} {old_queue}"
+              f" {time_queue(Queue, n):>8.4f}s {time_queue(Queue, n, bulk=True):>12.4f}s"
+              f" {time_stack(ListStack, n):>10.4f}s {time_stack(Stack, n):>8.4f}s"
+              f" {time_stack(Stack, n, bulk=True):>12.4f}s")
+
+
+if __name__ == '__main__':
+    main(run_all="--all" in sys.argv[1:])
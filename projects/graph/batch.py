@@ -0,0 +1,193 @@
+"""
+Batch distance and reachability queries from many sources over one Graph
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, compress, repeat
+
+from csr import CSRGraph
+from util import SharedArrays, attach_arrays
+
+# set in every worker process by _attach_shared_graph
+_offsets = None
+_neighbors = None
+_shared_blocks = None
+
+
+def _attach_shared_graph(specs):
+    """
+    Worker initializer: map the CSR arrays straight out of shared memory.
+    """
+    global _offsets, _neighbors, _shared_blocks
+    _shared_blocks, (_offsets, _neighbors) = attach_arrays(specs)
+
+
+def _bfs_levels(offsets, neighbors, source):
+    """
+    Return the vertex indices the vertex at index source reaches, one
+    list per hop count: levels[d] holds the vertices d hops away.
+    """
+    seen = bytearray(len(offsets) - 1)
+    seen[source] = 1
+    frontier = [source]
+    levels = []
+    while len(frontier) > 0:
+        levels.append(frontier)
+        next_frontier = []
+        for vertex in frontier:
+            for neighbor in neighbors[offsets[vertex]:offsets[vertex + 1]]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return levels
+
+
+def _pack_level(frontier, width):
+    vertices = list(frontier)
+    masks = b"".join(mask.to_bytes(width, "little") for mask in frontier.values())
+    return vertices, masks
+
+
+def _bit_parallel_levels(offsets, neighbors, sources):
+    """
+    Run the searches from all sources in the same sweep and return the
+    levels of all of them in packed form: one (vertices, masks) pair per
+    hop count, where masks holds a width-byte mask per vertex of the
+    sources that reach it at that hop count.
+
+    Every vertex carries an integer mask with one bit per source: seen
+    marks the sources that have reached it and frontier the sources
+    that reached it in the last level. Expanding a vertex pushes its
+    whole frontier mask to each neighbor at once, so one pass over the
+    edges advances the BFS of every source by one level.
+    """
+    width = (len(sources) + 7) // 8
+    seen = [0] * (len(offsets) - 1)
+    frontier = {}
+    for bit, source in enumerate(sources):
+        seen[source] |= 1 << bit
+        frontier[source] = frontier.get(source, 0) | 1 << bit
+
+    levels = []
+    while len(frontier) > 0:
+        levels.append(_pack_level(frontier, width))
+        next_frontier = {}
+        for vertex, mask in frontier.items():
+            for neighbor in neighbors[offsets[vertex]:offsets[vertex + 1]]:
+                # sources that reach the neighbor for the first time
+                new = mask & ~seen[neighbor]
+                if new:
+                    seen[neighbor] |= new
+                    next_frontier[neighbor] = next_frontier.get(neighbor, 0) | new
+        frontier = next_frontier
+    return levels
+
+
+# _BIT_TABLES[k] maps a byte to its k-th bit
+_BIT_TABLES = [bytes(value >> k & 1 for value in range(256)) for k in range(8)]
+
+
+def _unpack_levels(levels, bit, width):
+    """
+    Return the levels of the source with the given bit out of packed
+    levels, in the form _bfs_levels gives. Selecting the vertices is a
+    byte slice, a translate and a compress per level, none of which
+    loop in Python.
+    """
+    column = bit // 8
+    table = _BIT_TABLES[bit % 8]
+    return [
+        list(compress(vertices, masks[column::width].translate(table)))
+        for vertices, masks in levels
+    ]
+
+
+def _group_levels(offsets, neighbors, sources, bit_parallel):
+    if bit_parallel:
+        return _bit_parallel_levels(offsets, neighbors, sources)
+    return [_bfs_levels(offsets, neighbors, source) for source in sources]
+
+
+def _worker_levels(sources, bit_parallel):
+    return _group_levels(_offsets, _neighbors, sources, bit_parallel)
+
+
+def _chunks(values, size):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _split_groups(chunks, results, bit_parallel):
+    for chunk, result in zip(chunks, results):
+        if bit_parallel:
+            width = (len(chunk) + 7) // 8
+            for bit, source in enumerate(chunk):
+                yield source, _unpack_levels(result, bit, width)
+        else:
+            yield from zip(chunk, result)
+
+
+def _source_levels(csr, source_indices, max_workers, chunk_size, bit_parallel):
+    """
+    Yield (source index, levels) pairs, fanning the work out over a
+    process pool that shares the CSR arrays through shared memory.
+    Bit-parallel groups come back packed and are only unpacked one
+    source at a time, as the pairs are consumed.
+    """
+    chunks = list(_chunks(source_indices, chunk_size))
+    if max_workers == 1:
+        results = (_group_levels(csr.offsets, csr.neighbors, chunk, bit_parallel) for chunk in chunks)
+        yield from _split_groups(chunks, results, bit_parallel)
+        return
+
+    with SharedArrays(csr.offsets, csr.neighbors) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_shared_graph,
+            initargs=(shared.specs,)
+        ) as pool:
+            results = pool.map(_worker_levels, chunks, repeat(bit_parallel))
+            yield from _split_groups(chunks, results, bit_parallel)
+
+
+def batch_distances(graph, sources, max_workers=None, chunk_size=64, bit_parallel=False):
+    """
+    Return a dictionary mapping every source vertex to a dictionary of
+    the hop count to each vertex it can reach (itself included).
+
+    graph can be a Graph or a CSRGraph; a Graph is converted once.
+    max_workers=1 runs in this process, anything else uses a process
+    pool. Sources are handed out in groups of chunk_size.
+
+    With bit_parallel=True each group of chunk_size sources (64 by
+    default, one bit per source) is searched in a single sweep over
+    the edges instead of one BFS per source.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    labels = csr.labels
+    source_indices = [csr.index[source] for source in sources]
+
+    result = {}
+    for source, levels in _source_levels(csr, source_indices, max_workers, chunk_size, bit_parallel):
+        distances = {}
+        for distance, vertices in enumerate(levels):
+            distances.update(zip(map(labels.__getitem__, vertices), repeat(distance)))
+        result[labels[source]] = distances
+    return result
+
+
+def batch_reachability(graph, sources, max_workers=None, chunk_size=64, bit_parallel=False):
+    """
+    Return a dictionary mapping every source vertex to the set of
+    vertices it can reach (itself included).
+
+    Takes the same arguments as batch_distances.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    labels = csr.labels
+    source_indices = [csr.index[source] for source in sources]
+
+    result = {}
+    for source, levels in _source_levels(csr, source_indices, max_workers, chunk_size, bit_parallel):
+        result[labels[source]] = set(map(labels.__getitem__, chain.from_iterable(levels)))
+    return result
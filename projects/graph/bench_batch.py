@@ -0,0 +1,45 @@
+"""
+Benchmark "distance from every seed vertex" jobs: one CSR BFS per seed
+against the bit-parallel sweep that advances 64 seeds at a time.
+
+Run with: python bench_batch.py
+"""
+import random
+import time
+
+from batch import batch_distances, batch_reachability
+from bench_search import random_graph
+from csr import CSRGraph
+
+
+def best_time(job, repeats=3):
+    """
+    Return the result of job and its fastest run time.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = job()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main(num_vertices=20000, avg_degree=3, num_seeds=64, seed=1):
+    rng = random.Random(seed)
+    csr = CSRGraph.from_graph(random_graph(num_vertices, avg_degree, rng))
+    seeds = rng.sample(range(num_vertices), num_seeds)
+
+    print(f"{num_vertices} vertices, {num_seeds} seeds")
+    print(f"  {'query':<14} {'BFS per seed':>14} {'bit-parallel':>14} {'speedup':>9}")
+    for name, query in (("distances", batch_distances), ("reachability", batch_reachability)):
+        per_seed, per_seed_time = best_time(lambda: query(csr, seeds, max_workers=1))
+        sweep, sweep_time = best_time(lambda: query(csr, seeds, max_workers=1, bit_parallel=True))
+        assert sweep == per_seed
+        print(f"  {name:<14} {per_seed_time:>13.2f}s {sweep_time:>13.2f}s {per_seed_time / sweep_time:>8.2f}x")
+
+    _, pooled = best_time(lambda: batch_distances(csr, seeds, bit_parallel=True, chunk_size=max(1, num_seeds // 4)), 1)
+    print(f"  bit-parallel distances over a process pool {pooled:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
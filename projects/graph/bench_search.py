@@ -0,0 +1,121 @@
+"""
+Benchmark the parent-pointer bfs/dfs against the original
+path-copying searches on large random graphs, and the
+bidirectional bfs against the one-way bfs.
+
+Run with: python bench_search.py
+"""
+import random
+import time
+
+from graph import Graph
+from util import Stack, Queue
+
+
+def path_copy_bfs(graph, starting_vertex, destination_vertex):
+    # the original Graph.bfs: every queued entry is a full copy of its path
+    queue = Queue()
+    queue.enqueue([starting_vertex])
+    visited_vertices = set()
+    while queue.size() > 0:
+        current_path = queue.dequeue()
+        current_vertex = current_path[-1]
+        if current_vertex not in visited_vertices:
+            if current_vertex == destination_vertex:
+                return current_path
+            visited_vertices.add(current_vertex)
+            for vertex in graph.get_neighbors(current_vertex):
+                new_path = current_path.copy()
+                new_path.append(vertex)
+                queue.enqueue(new_path)
+    return None
+
+
+def path_copy_dfs(graph, starting_vertex, destination_vertex):
+    # the original Graph.dfs: every pushed entry is a full copy of its path
+    stack = Stack()
+    stack.push([starting_vertex])
+    visited_vertices = set()
+    while stack.size() > 0:
+        current_path = stack.pop()
+        current_vertex = current_path[-1]
+        if current_vertex not in visited_vertices:
+            if current_vertex == destination_vertex:
+                return current_path
+            visited_vertices.add(current_vertex)
+            for vertex in graph.get_neighbors(current_vertex):
+                new_path = current_path.copy()
+                new_path.append(vertex)
+                stack.push(new_path)
+    return None
+
+
+def random_graph(num_vertices, avg_degree, rng):
+    graph = Graph()
+    for vertex in range(num_vertices):
+        graph.add_vertex(vertex)
+    for _ in range(num_vertices * avg_degree):
+        graph.add_edge(rng.randrange(num_vertices), rng.randrange(num_vertices))
+    return graph
+
+
+def bidirectional_bfs(graph, starting_vertex, destination_vertex):
+    return graph.bfs(starting_vertex, destination_vertex, bidirectional=True)
+
+
+def count_expansions(search, graph, queries):
+    # count how many vertices have their edges looked at
+    expanded = 0
+    get_neighbors = graph.get_neighbors
+    get_predecessors = graph.get_predecessors
+
+    def counted(lookup):
+        def wrapper(vertex_id):
+            nonlocal expanded
+            expanded += 1
+            return lookup(vertex_id)
+        return wrapper
+
+    graph.get_neighbors = counted(get_neighbors)
+    graph.get_predecessors = counted(get_predecessors)
+    try:
+        for starting_vertex, destination_vertex in queries:
+            search(graph, starting_vertex, destination_vertex)
+    finally:
+        del graph.get_neighbors
+        del graph.get_predecessors
+    return expanded
+
+
+def time_queries(search, graph, queries):
+    start = time.perf_counter()
+    for starting_vertex, destination_vertex in queries:
+        search(graph, starting_vertex, destination_vertex)
+    return time.perf_counter() - start
+
+
+def main(sizes=(1000, 5000, 20000), avg_degree=3, num_queries=20, seed=1):
+    rng = random.Random(seed)
+    print(f"{'vertices':>9} {'search':>7} {'path copy':>11} {'parents':>11} {'speedup':>8}")
+    for num_vertices in sizes:
+        graph = random_graph(num_vertices, avg_degree, rng)
+        queries = [(rng.randrange(num_vertices), rng.randrange(num_vertices)) for _ in range(num_queries)]
+        for name, old, new in (("bfs", path_copy_bfs, Graph.bfs), ("dfs", path_copy_dfs, Graph.dfs)):
+            old_time = time_queries(old, graph, queries)
+            new_time = time_queries(new, graph, queries)
+            print(f"{num_vertices:>9} {name:>7} {old_time:>10.3f}s {new_time:>10.3f}s {old_time / new_time:>7.1f}x")
+
+    print()
+    print(f"{'vertices':>9} {'bfs expanded':>13} {'bidirectional':>14} {'bfs time':>9} {'bidirectional':>14}")
+    for num_vertices in sizes + (200000,):
+        graph = random_graph(num_vertices, avg_degree, rng)
+        queries = [(rng.randrange(num_vertices), rng.randrange(num_vertices)) for _ in range(num_queries)]
+        one_way = count_expansions(Graph.bfs, graph, queries)
+        two_way = count_expansions(bidirectional_bfs, graph, queries)
+        one_way_time = time_queries(Graph.bfs, graph, queries)
+        two_way_time = time_queries(bidirectional_bfs, graph, queries)
+        print(f"{num_vertices:>9} {one_way:>13} {two_way:>14} {one_way_time:>8.3f}s {two_way_time:>13.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Compact, read-only graph representation in compressed sparse row (CSR) form
+"""
+from array import array
+from graph import Graph
+
+
+class CSRGraph(Graph):
+    """
+    Represent an immutable graph as two flat integer arrays.
+
+    Every vertex label is mapped to a dense index 0..n-1. The neighbors of the
+    vertex at index i are the indices stored in
+    neighbors[offsets[i]:offsets[i + 1]], so the whole adjacency costs a few
+    bytes per edge instead of a set per vertex.
+
+    The traversal and search methods are inherited from Graph and give the
+    same results, since they only talk to the graph through get_neighbors.
+    """
+
+    def __init__(self, labels, offsets, neighbors):
+        # index -> label and label -> index
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        # offsets has one more entry than there are vertices
+        self.offsets = offsets
+        self.neighbors = neighbors
+        # the reverse adjacency is only built by the first backward search
+        self.reverse_offsets = None
+        self.reverse_neighbors = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a CSR copy of an existing Graph.
+
+        Neighbors keep the iteration order of the source graph's edge sets,
+        so traversals visit vertices in exactly the same order.
+        """
+        labels = list(graph.vertices)
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = array("q", [0])
+        neighbors = array("q")
+        for label in labels:
+            neighbors.extend(index[vertex] for vertex in graph.vertices[label])
+            offsets.append(len(neighbors))
+        return cls(labels, offsets, neighbors)
+
+    @classmethod
+    def from_edges(cls, edges, vertices=()):
+        """
+        Build a CSR graph from a bulk iterable of directed (v1, v2) edges.
+
+        Vertices are created as they are first seen; pass vertices to add
+        isolated vertices or to fix the order of the labels. Duplicate edges
+        are stored once, like Graph.add_edge does.
+        """
+        labels = []
+        index = {}
+
+        def index_of(label):
+            if label not in index:
+                index[label] = len(labels)
+                labels.append(label)
+            return index[label]
+
+        for vertex in vertices:
+            index_of(vertex)
+
+        # first pass: translate the edges into two flat index arrays
+        sources = array("q")
+        targets = array("q")
+        for v1, v2 in edges:
+            sources.append(index_of(v1))
+            targets.append(index_of(v2))
+
+        # count the out-degree of every vertex and turn it into offsets
+        offsets = array("q", bytes(8 * (len(labels) + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for i in range(len(labels)):
+            offsets[i + 1] += offsets[i]
+
+        # second pass: drop every target into its source's slot
+        neighbors = array("q", bytes(8 * len(targets)))
+        fill = array("q", offsets)
+        for source, target in zip(sources, targets):
+            neighbors[fill[source]] = target
+            fill[source] += 1
+        del sources, targets, fill
+
+        # remove duplicate edges while keeping the first-seen order
+        unique = array("q")
+        compact_offsets = array("q", [0])
+        for i in range(len(labels)):
+            seen = set()
+            for target in neighbors[offsets[i]:offsets[i + 1]]:
+                if target not in seen:
+                    seen.add(target)
+                    unique.append(target)
+            compact_offsets.append(len(unique))
+
+        return cls(labels, compact_offsets, unique)
+
+    def add_vertex(self, vertex_id):
+        raise TypeError("CSRGraph is immutable, build it from a Graph or an edge list")
+
+    def add_edge(self, v1, v2):
+        raise TypeError("CSRGraph is immutable, build it from a Graph or an edge list")
+
+    def __iter__(self):
+        """
+        Iterate over the labels of all vertices.
+        """
+        return iter(self.labels)
+
+    def get_neighbors(self, vertex_id):
+        """
+        Get all neighbors (edges) of a vertex.
+        """
+        if vertex_id in self.index:
+            i = self.index[vertex_id]
+            labels = self.labels
+            return [labels[j] for j in self.neighbors[self.offsets[i]:self.offsets[i + 1]]]
+
+    def get_predecessors(self, vertex_id):
+        """
+        Get all vertices with an edge to a vertex.
+        """
+        if vertex_id in self.index:
+            if self.reverse_offsets is None:
+                self._build_reverse()
+            i = self.index[vertex_id]
+            labels = self.labels
+            return [labels[j] for j in self.reverse_neighbors[self.reverse_offsets[i]:self.reverse_offsets[i + 1]]]
+
+    def _build_reverse(self):
+        """
+        Build the reverse adjacency in CSR form with a counting sort.
+        """
+        num_vertices = len(self.labels)
+        offsets = array("q", bytes(8 * (num_vertices + 1)))
+        for target in self.neighbors:
+            offsets[target + 1] += 1
+        for i in range(num_vertices):
+            offsets[i + 1] += offsets[i]
+
+        neighbors = array("q", bytes(8 * len(self.neighbors)))
+        fill = array("q", offsets)
+        for source in range(num_vertices):
+            for target in self.neighbor_indices(source):
+                neighbors[fill[target]] = source
+                fill[target] += 1
+
+        self.reverse_offsets = offsets
+        self.reverse_neighbors = neighbors
+
+    def neighbor_indices(self, i):
+        """
+        Get the neighbor indices of the vertex at index i.
+        """
+        return self.neighbors[self.offsets[i]:self.offsets[i + 1]]
+
+    def num_vertices(self):
+        return len(self.labels)
+
+    def num_edges(self):
+        return len(self.neighbors)
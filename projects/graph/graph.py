@@ -38,6 +38,8 @@ class Graph:
 
     def __init__(self):
         self.vertices = {}
+        # the same edges pointing the other way, for backward searches
+        self.reverse_vertices = {}
 
     def add_vertex(self, vertex_id):
         """
@@ -46,6 +48,7 @@ class Graph:
         # Create new key with vertex ID without any edges
         if vertex_id not in self.vertices:
             self.vertices[vertex_id] = set()
+            self.reverse_vertices[vertex_id] = set()
 
     def add_edge(self, v1, v2):
         """
@@ -54,6 +57,13 @@ class Graph:
         # Find vertex v1 and v2 in out vertices and add v2 to the edges of v1
         if v1 in self.vertices and v2 in self.vertices:
             self.vertices[v1].add(v2)
+            self.reverse_vertices[v2].add(v1)
+
+    def __iter__(self):
+        """
+        Iterate over the labels of all vertices.
+        """
+        return iter(self.vertices)
 
     def get_neighbors(self, vertex_id):
         """
@@ -62,41 +72,47 @@ class Graph:
         if vertex_id in self.vertices:
             return self.vertices[vertex_id]
 
-    def bft(self, starting_vertex):
+    def get_predecessors(self, vertex_id):
         """
-        Print each vertex in breadth-first order
+        Get all vertices with an edge to a vertex.
+        """
+        if vertex_id in self.reverse_vertices:
+            return self.reverse_vertices[vertex_id]
+
+    def iter_bft(self, starting_vertex):
+        """
+        Yield each vertex in breadth-first order
         beginning from starting_vertex.
+
+        Vertices are produced as they are visited, so the caller
+        can stop the traversal early by breaking out of the loop.
         """
-        result = ""
         # create an empty queue and enqueue the starting vertex
         queue = Queue()
         queue.enqueue(starting_vertex)
-        # create an empty set to track visited vertices
-        visited_vertices = set()
+        # track vertices as soon as they are queued, so the queue
+        # never holds more than one entry per vertex
+        queued_vertices = {starting_vertex}
 
         # while the queue is not empty:
         while queue.size() > 0:
             # get current vertex and dequeue it
             current_vertex = queue.dequeue()
+            yield current_vertex
 
-            # check if the current vertex has not been visited:
-            if current_vertex not in visited_vertices:
-                # print the current vertex
-                result += str(current_vertex) + ", "
-
-                # mark the current vertex as visited
-                visited_vertices.add(current_vertex)
-
-                # enqueue all the current vertex's neighbors
-                for vertex in self.get_neighbors(current_vertex):
+            # enqueue all the current vertex's neighbors not seen yet
+            for vertex in self.get_neighbors(current_vertex):
+                if vertex not in queued_vertices:
+                    queued_vertices.add(vertex)
                     queue.enqueue(vertex)
 
-        print(result[:len(result) - 2])
-
-    def dft(self, starting_vertex):
+    def iter_dft(self, starting_vertex):
         """
-        Print each vertex in depth-first order
+        Yield each vertex in depth-first order
         beginning from starting_vertex.
+
+        Vertices are produced as they are visited, so the caller
+        can stop the traversal early by breaking out of the loop.
         """
         # create an empty stack and add the starting vertex
         stack = Stack()
@@ -104,8 +120,6 @@ class Graph:
         # create an empty set to track visited vertices
         visited_vertices = set()
 
-        result = ""
-
         # while the stack is not empty:
         while stack.size() > 0:
             # get current vertex and pop it
@@ -113,77 +127,180 @@ class Graph:
 
             # check if the current vertex has not been visited:
             if current_vertex not in visited_vertices:
-                # print the current vertex
-                result += str(current_vertex) + ", "
-
                 # mark the current vertex as visited
                 visited_vertices.add(current_vertex)
+                yield current_vertex
 
                 # push up all the current vertex's neighbors
-                for vertex in self.get_neighbors(current_vertex):
-                    stack.push(vertex)
-
-        print(result[:len(result) - 2])
+                stack.extend(self.get_neighbors(current_vertex))
 
-    visited_vertices = set()
+    def bft(self, starting_vertex):
+        """
+        Print each vertex in breadth-first order
+        beginning from starting_vertex.
+        """
+        for vertex in self.iter_bft(starting_vertex):
+            print(vertex)
 
-    def dft_recursive(self, starting_vertex):
+    def dft(self, starting_vertex):
         """
         Print each vertex in depth-first order
         beginning from starting_vertex.
+        """
+        for vertex in self.iter_dft(starting_vertex):
+            print(vertex)
 
-        This should be done using recursion.
+    def walk_depth_first(self, starting_vertex, pre_visit=None, post_visit=None, visited=None):
         """
+        Visit every vertex reachable from starting_vertex in the same
+        order as a recursive depth-first traversal, but with an explicit
+        stack, so long chains cannot hit the recursion limit.
+
+        pre_visit(vertex) is called when a vertex is entered and
+        post_visit(vertex) once all of its neighbors are finished. If
+        pre_visit returns a true value the walk stops right away and the
+        path from starting_vertex to that vertex is returned, otherwise
+        None is returned. Pass the same visited set to several walks to
+        skip vertices an earlier walk already reached.
+        """
+        if visited is None:
+            visited = set()
+        if starting_vertex in visited:
+            return None
+
+        visited.add(starting_vertex)
+        if pre_visit is not None and pre_visit(starting_vertex):
+            return [starting_vertex]
+
+        # path holds the vertices being visited, and neighbors holds
+        # the unfinished neighbor iterator of each of them
+        path = [starting_vertex]
+        neighbors = [iter(self.get_neighbors(starting_vertex))]
+
+        while len(neighbors) > 0:
+            # enter the next unvisited neighbor of the deepest vertex
+            for vertex in neighbors[-1]:
+                if vertex not in visited:
+                    visited.add(vertex)
+                    path.append(vertex)
+                    if pre_visit is not None and pre_visit(vertex):
+                        return path
+                    neighbors.append(iter(self.get_neighbors(vertex)))
+                    break
+            else:
+                # every neighbor is done, so leave the deepest vertex
+                neighbors.pop()
+                vertex = path.pop()
+                if post_visit is not None:
+                    post_visit(vertex)
+
+        return None
 
-        if starting_vertex not in self.visited_vertices:
-            print(starting_vertex, end=", ")
-            self.visited_vertices.add(starting_vertex)
+    def dft_recursive(self, starting_vertex):
+        """
+        Print each vertex in depth-first order
+        beginning from starting_vertex.
 
-            for vertex in self.get_neighbors(starting_vertex):
-                self.dft_recursive(vertex)
+        This visits vertices in the order the recursive
+        traversal would, see walk_depth_first.
+        """
+        self.walk_depth_first(starting_vertex, pre_visit=print)
 
-    def bfs(self, starting_vertex, destination_vertex):
+    def bfs(self, starting_vertex, destination_vertex, bidirectional=False):
         """
         Return a list containing the shortest path from
         starting_vertex to destination_vertex in
         breath-first order.
+
+        With bidirectional=True the search also runs backward from
+        the destination, which expands far fewer vertices when the
+        two are far apart.
         """
-        # create an empty queue and enqueue the path to starting vertex
-        queue = Queue()
-        queue.enqueue([starting_vertex])
-        # create an empty set to track visited vertices
-        visited_vertices = set()
+        # the starting vertex is a path to itself
+        if starting_vertex == destination_vertex:
+            return [starting_vertex]
+
+        if bidirectional:
+            return self._bidirectional_bfs(starting_vertex, destination_vertex)
 
-        shortest_path = None
+        # create an empty queue and enqueue the starting vertex
+        queue = Queue()
+        queue.enqueue(starting_vertex)
+        # map every discovered vertex to the vertex it was reached from
+        parents = {starting_vertex: starting_vertex}
 
         # while the queue is not empty:
         while queue.size() > 0:
-            # get current vertex path and dequeue it
-            current_path = queue.dequeue()
-            # set the current vertex to the last element of the path
-            current_vertex = current_path[-1]
+            # get current vertex and dequeue it
+            current_vertex = queue.dequeue()
 
-            # check if the current vertex has not been visited:
-            if current_vertex not in visited_vertices:
+            # discover each neighbor that has not been seen yet
+            for vertex in self.get_neighbors(current_vertex):
+                if vertex not in parents:
+                    parents[vertex] = current_vertex
 
-                # check if the current vertex is destination
-                if current_vertex == destination_vertex:
-                    # It is the shortest path so return it
-                    return current_path
+                    # the first time the destination is discovered it is
+                    # on a shortest path, so stop and rebuild that path
+                    if vertex == destination_vertex:
+                        return self._build_path(parents, vertex)
 
-                # mark the current vertex as visited
-                visited_vertices.add(current_vertex)
+                    queue.enqueue(vertex)
 
-                # enqueue new paths with each neighbor
-                for vertex in self.get_neighbors(current_vertex):
-                    # take current path
-                    new_path = current_path.copy()
-                    # append neighbor to it
-                    new_path.append(vertex)
-                    # queue up new path
-                    queue.enqueue(new_path)
+        return None
 
-        return shortest_path
+    def _bidirectional_bfs(self, starting_vertex, destination_vertex):
+        """
+        Return the shortest path from starting_vertex to
+        destination_vertex by searching forward from the start and
+        backward from the destination until the two searches meet.
+        """
+        # forward_parents maps a vertex to the vertex it was reached
+        # from, backward_parents maps it to the next vertex on the way
+        # to the destination
+        forward_parents = {starting_vertex: starting_vertex}
+        backward_parents = {destination_vertex: destination_vertex}
+        forward_frontier = [starting_vertex]
+        backward_frontier = [destination_vertex]
+
+        while len(forward_frontier) > 0 and len(backward_frontier) > 0:
+            # always expand one whole level of the smaller frontier
+            if len(forward_frontier) <= len(backward_frontier):
+                next_frontier = []
+                for current_vertex in forward_frontier:
+                    for vertex in self.get_neighbors(current_vertex):
+                        if vertex not in forward_parents:
+                            forward_parents[vertex] = current_vertex
+                            # the first vertex both searches have seen
+                            # joins them on a shortest path
+                            if vertex in backward_parents:
+                                return self._join_paths(forward_parents, backward_parents, vertex)
+                            next_frontier.append(vertex)
+                forward_frontier = next_frontier
+            else:
+                next_frontier = []
+                for current_vertex in backward_frontier:
+                    for vertex in self.get_predecessors(current_vertex):
+                        if vertex not in backward_parents:
+                            backward_parents[vertex] = current_vertex
+                            if vertex in forward_parents:
+                                return self._join_paths(forward_parents, backward_parents, vertex)
+                            next_frontier.append(vertex)
+                backward_frontier = next_frontier
+
+        return None
+
+    @classmethod
+    def _join_paths(cls, forward_parents, backward_parents, meeting_vertex):
+        """
+        Join the forward path to meeting_vertex with the backward
+        path from it to the destination.
+        """
+        path = cls._build_path(forward_parents, meeting_vertex)
+        vertex = meeting_vertex
+        while backward_parents[vertex] != vertex:
+            vertex = backward_parents[vertex]
+            path.append(vertex)
+        return path
 
     def dfs(self, starting_vertex, destination_vertex):
         """
@@ -191,38 +308,49 @@ class Graph:
         starting_vertex to destination_vertex in
         depth-first order.
         """
-        # create an empty stack and push the path to starting vertex
+        # create an empty stack and push the starting vertex with its parent
         stack = Stack()
-        stack.push([starting_vertex])
-        # create an empty set to track visited vertices
-        visited_vertices = set()
+        stack.push((starting_vertex, starting_vertex))
+        # map every visited vertex to the vertex it was reached from
+        parents = {}
 
         # while the stack is not empty:
         while stack.size() > 0:
-            # get current vertex path and pop it
-            current_path = stack.pop()
-            # set the current vertex to the last element of the path
-            current_vertex = current_path[-1]
+            # get current vertex and the vertex it came from and pop them
+            current_vertex, parent = stack.pop()
 
             # check if the current vertex has not been visited:
-            if current_vertex not in visited_vertices:
+            if current_vertex not in parents:
+                # mark the current vertex as visited
+                parents[current_vertex] = parent
 
                 # check if the current vertex is destination
                 if current_vertex == destination_vertex:
-                    # if it is stop and return it
-                    return current_path
+                    return self._build_path(parents, current_vertex)
 
-                # mark the current vertex as visited
-                visited_vertices.add(current_vertex)
-
-                # push new paths with each neighbor
+                # push each neighbor that has not been visited
                 for vertex in self.get_neighbors(current_vertex):
-                    # take current path
-                    new_path = current_path.copy()
-                    # append neighbor to it
-                    new_path.append(vertex)
-                    # queue up new path
-                    stack.push(new_path)
+                    if vertex not in parents:
+                        # stop as soon as the destination is discovered
+                        if vertex == destination_vertex:
+                            parents[vertex] = current_vertex
+                            return self._build_path(parents, vertex)
+
+                        stack.push((vertex, current_vertex))
+
+    @staticmethod
+    def _build_path(parents, vertex):
+        """
+        Walk the parent pointers back from vertex to the starting
+        vertex (the only vertex that is its own parent) and return
+        the path from the start to vertex.
+        """
+        path = [vertex]
+        while parents[vertex] != vertex:
+            vertex = parents[vertex]
+            path.append(vertex)
+        path.reverse()
+        return path
 
     def dfs_recursive(self, starting_vertex, destination_vertex):
         """
@@ -230,21 +358,27 @@ class Graph:
         starting_vertex to destination_vertex in
         depth-first order.
 
-        This should be done using recursion.
+        This returns the path the recursive search
+        would, see walk_depth_first.
         """
-        path = list()
-        path.append(starting_vertex)
-        if starting_vertex not in self.visited_vertices:
-            if starting_vertex == destination_vertex:
-                return path
+        return self.walk_depth_first(
+            starting_vertex,
+            pre_visit=lambda vertex: vertex == destination_vertex
+        )
 
-            self.visited_vertices.add(starting_vertex)
+    def topological_sort(self):
+        """
+        Return a list of all vertices where every edge points from
+        an earlier vertex to a later one. The graph must not have cycles.
+        """
+        visited = set()
+        finished = []
+        for vertex in self:
+            self.walk_depth_first(vertex, post_visit=finished.append, visited=visited)
 
-            for vertex in self.get_neighbors(starting_vertex):
-                new_path = self.dfs_recursive(vertex, destination_vertex)
-                if new_path:
-                    path = path.__add__(new_path)
-                    return path
+        # a vertex finishes only after everything it points to
+        finished.reverse()
+        return finished
 
 
 if __name__ == '__main__':
@@ -300,8 +434,6 @@ if __name__ == '__main__':
     '''
     graph.dft(1)
     graph.dft_recursive(1)
-    graph.visited_vertices = set()
-    print()
 
     '''
     Valid BFS path:
@@ -2,6 +2,8 @@ import unittest
 import sys
 import io
 from graph import Graph
+from csr import CSRGraph
+from batch import batch_distances, batch_reachability
 
 class Test(unittest.TestCase):
     def setUp(self):
@@ -80,6 +82,16 @@ class Test(unittest.TestCase):
 
         sys.stdout = stdout_  # Restore stdout
 
+    def test_iter_traversals(self):
+        self.assertListEqual(sorted(self.graph.iter_bft(1)), [1, 2, 3, 4, 5, 6, 7])
+        self.assertListEqual(sorted(self.graph.iter_dft(1)), [1, 2, 3, 4, 5, 6, 7])
+
+        # stopping early only visits what was consumed
+        traversal = self.graph.iter_bft(1)
+        self.assertEqual(next(traversal), 1)
+        self.assertEqual(next(traversal), 2)
+        traversal.close()
+
     def test_dft_recursive(self):
         dft = [
             "1\n2\n3\n5\n4\n6\n7\n",
@@ -97,10 +109,98 @@ class Test(unittest.TestCase):
 
         sys.stdout = stdout_  # Restore stdout
 
+    def test_recursive_traversals_are_stack_safe(self):
+        chain = Graph()
+        for vertex in range(5000):
+            chain.add_vertex(vertex)
+            chain.add_edge(vertex - 1, vertex)
+
+        path = chain.dfs_recursive(0, 4999)
+        self.assertListEqual(path, list(range(5000)))
+        # nothing is left over between calls
+        self.assertListEqual(chain.dfs_recursive(0, 4999), path)
+
+        stdout_ = sys.stdout
+        sys.stdout = io.StringIO()
+        chain.dft_recursive(0)
+        output = sys.stdout.getvalue()
+        sys.stdout = stdout_  # Restore stdout
+
+        self.assertEqual(output, "".join(f"{vertex}\n" for vertex in range(5000)))
+
+    def test_walk_depth_first_callbacks(self):
+        entered = []
+        finished = []
+        self.graph.walk_depth_first(1, pre_visit=entered.append, post_visit=finished.append)
+        self.assertEqual(entered[0], 1)
+        self.assertEqual(finished[-1], 1)
+        self.assertListEqual(sorted(entered), sorted(finished))
+
+    def test_topological_sort(self):
+        dag = Graph()
+        for vertex in range(1, 7):
+            dag.add_vertex(vertex)
+        for v1, v2 in [(1, 3), (2, 3), (3, 6), (5, 6), (4, 5), (1, 2)]:
+            dag.add_edge(v1, v2)
+
+        order = dag.topological_sort()
+        self.assertListEqual(sorted(order), [1, 2, 3, 4, 5, 6])
+        for v1 in dag.vertices:
+            for v2 in dag.get_neighbors(v1):
+                self.assertLess(order.index(v1), order.index(v2))
+
     def test_bfs(self):
         bfs = [1, 2, 4, 6]
         self.assertListEqual(self.graph.bfs(1, 6), bfs)
 
+    def test_bidirectional_bfs(self):
+        self.assertListEqual(self.graph.bfs(1, 6, bidirectional=True), [1, 2, 4, 6])
+        self.assertListEqual(self.graph.bfs(6, 6, bidirectional=True), [6])
+        self.assertListEqual(self.graph.bfs(7, 5, bidirectional=True), [7, 6, 3, 5])
+        self.assertSetEqual(self.graph.get_predecessors(3), {2, 5, 6})
+
+        csr = CSRGraph.from_graph(self.graph)
+        self.assertListEqual(sorted(csr.get_predecessors(3)), [2, 5, 6])
+        self.assertListEqual(csr.bfs(1, 6, bidirectional=True), [1, 2, 4, 6])
+
+        self.graph.add_vertex(8)
+        self.assertIsNone(self.graph.bfs(1, 8, bidirectional=True))
+        self.assertIsNone(self.graph.bfs(8, 1, bidirectional=True))
+
+    def test_batch_queries(self):
+        distances = batch_distances(self.graph, [1, 3], max_workers=1)
+        self.assertDictEqual(distances[1], {1: 0, 2: 1, 3: 2, 4: 2, 5: 3, 6: 3, 7: 3})
+        self.assertDictEqual(distances[3], {3: 0, 5: 1})
+        self.assertDictEqual(batch_distances(self.graph, [1, 3], max_workers=2, chunk_size=1), distances)
+
+        reachable = batch_reachability(self.graph, [5, 7], max_workers=2)
+        self.assertDictEqual(reachable, {5: {3, 5}, 7: {1, 2, 3, 4, 5, 6, 7}})
+
+    def test_bit_parallel_batch_queries(self):
+        sources = [1, 2, 3, 4, 5, 6, 7]
+        distances = batch_distances(self.graph, sources, max_workers=1)
+        self.assertDictEqual(batch_distances(self.graph, sources, max_workers=1, bit_parallel=True), distances)
+        self.assertDictEqual(batch_distances(self.graph, sources, max_workers=2, chunk_size=3, bit_parallel=True), distances)
+        self.assertDictEqual(batch_reachability(self.graph, [3], max_workers=1, bit_parallel=True), {3: {3, 5}})
+
+        # more than eight sources per group, so the masks span several bytes
+        edges = [(i, (i * 7 + 3) % 20) for i in range(20)] + [(i, (i + 1) % 20) for i in range(0, 20, 3)]
+        csr = CSRGraph.from_edges(edges)
+        sources = list(range(20))
+        distances = batch_distances(csr, sources, max_workers=1)
+        self.assertDictEqual(batch_distances(csr, sources, max_workers=1, chunk_size=20, bit_parallel=True), distances)
+        self.assertDictEqual(
+            batch_reachability(csr, sources, max_workers=1, chunk_size=20, bit_parallel=True),
+            {source: set(reached) for source, reached in distances.items()}
+        )
+
+    def test_search_edge_cases(self):
+        self.graph.add_vertex(8)
+        self.assertListEqual(self.graph.bfs(4, 4), [4])
+        self.assertListEqual(self.graph.dfs(4, 4), [4])
+        self.assertIsNone(self.graph.bfs(1, 8))
+        self.assertIsNone(self.graph.dfs(1, 8))
+
     def test_dfs(self):
         dfs = [
             [1, 2, 4, 6],
@@ -115,5 +215,23 @@ class Test(unittest.TestCase):
         ]
         self.assertIn(self.graph.dfs_recursive(1,6), dfs)
 
+    def test_csr_from_graph(self):
+        csr = CSRGraph.from_graph(self.graph)
+        for vertex in self.graph.vertices:
+            self.assertListEqual(csr.get_neighbors(vertex), list(self.graph.get_neighbors(vertex)))
+        self.assertEqual(csr.num_edges(), 10)
+        self.assertListEqual(csr.bfs(1, 6), self.graph.bfs(1, 6))
+        self.assertListEqual(csr.dfs(1, 6), self.graph.dfs(1, 6))
+
+    def test_csr_from_edges(self):
+        edges = [(5, 3), (6, 3), (7, 1), (4, 7), (1, 2), (7, 6), (2, 4), (3, 5), (2, 3), (4, 6), (2, 4)]
+        csr = CSRGraph.from_edges(edges)
+        self.assertEqual(csr.num_vertices(), 7)
+        self.assertEqual(csr.num_edges(), 10)
+        self.assertListEqual(csr.get_neighbors(2), [4, 3])
+        self.assertListEqual(csr.bfs(1, 6), [1, 2, 4, 6])
+        self.assertIn(csr.dfs(1, 6), [[1, 2, 4, 6], [1, 2, 4, 7, 6]])
+        self.assertRaises(TypeError, csr.add_edge, 1, 3)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,28 +1,13 @@
+# The Queue and Stack classes are shared by every project and live in
+# projects/structures.py, and the shared memory helpers for process pools
+# live in projects/shared_arrays.py; this module only makes them
+# importable from here.
+import os
+import sys
 
-# Note: This Queue class is sub-optimal. Why?
-class Queue():
-    def __init__(self):
-        self.queue = []
-    def enqueue(self, value):
-        self.queue.append(value)
-    def dequeue(self):
-        if self.size() > 0:
-            return self.queue.pop(0)
-        else:
-            return None
-    def size(self):
-        return len(self.queue)
-
-class Stack():
-    def __init__(self):
-        self.stack = []
-    def push(self, value):
-        self.stack.append(value)
-    def pop(self):
-        if self.size() > 0:
-            return self.stack.pop()
-        else:
-            return None
-    def size(self):
-        return len(self.stack)
+_projects_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _projects_dir not in sys.path:
+    sys.path.append(_projects_dir)
 
+from structures import Queue, Stack  # noqa: E402
+from shared_arrays import SharedArrays, attach_arrays  # noqa: E402
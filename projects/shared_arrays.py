@@ -0,0 +1,45 @@
+"""
+int64 arrays handed to process pool workers through shared memory
+"""
+from multiprocessing import shared_memory
+
+
+class SharedArrays():
+    """
+    Copies of int64 arrays in new shared memory blocks, which are freed
+    when the with block ends. Pass specs to the workers' initializer,
+    which can map the arrays with attach_arrays instead of receiving a
+    pickled copy with every task.
+    """
+    def __init__(self, *arrays):
+        self.blocks = []
+        self.specs = []
+        try:
+            for values in arrays:
+                block = shared_memory.SharedMemory(create=True, size=max(1, len(values) * 8))
+                self.blocks.append(block)
+                block.buf[:len(values) * 8] = values.tobytes()
+                self.specs.append((block.name, len(values)))
+        except BaseException:
+            self.close()
+            raise
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc_info):
+        self.close()
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach_arrays(specs):
+    """
+    Map the arrays of a SharedArrays in a worker process without copying
+    them. Returns the blocks, which have to stay referenced while the
+    arrays are in use, and an int64 memoryview per array.
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name, _ in specs]
+    views = [block.buf[:length * 8].cast("q") for block, (_, length) in zip(blocks, specs)]
+    return blocks, views
@@ -0,0 +1,140 @@
+"""
+Network statistics for every user of a SocialGraph, computed in parallel
+
+Run with: python analytics.py [num_users] [avg_friendships]
+"""
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from social import SocialGraph
+from util import SharedArrays, attach_arrays
+
+# set in every worker process by _attach_shared_friendships
+_offsets = None
+_friends = None
+_shared_blocks = None
+
+
+def _compact_friendships(social_graph):
+    """
+    Flatten the friendship sets into two int64 arrays. The friends of
+    user_id are friends[offsets[user_id]:offsets[user_id + 1]].
+    """
+    offsets = array("q", [0, 0])
+    friends = array("q")
+    for user_id in range(1, social_graph.last_id + 1):
+        friends.extend(social_graph.friendships.get(user_id, ()))
+        offsets.append(len(friends))
+    return offsets, friends
+
+
+def _attach_shared_friendships(specs):
+    """
+    Worker initializer: map the friendship arrays straight out of shared
+    memory.
+    """
+    global _offsets, _friends, _shared_blocks
+    _shared_blocks, (_offsets, _friends) = attach_arrays(specs)
+
+
+def _user_stats(offsets, friends, user_ids):
+    """
+    Return (user_id, reach, total separation) for each user, where reach
+    counts the other users in their network and total separation adds
+    up the friendship hops to all of them.
+    """
+    # seen[v] holds the last user whose search reached v, so one array
+    # serves every search without being cleared
+    seen = array("q", [0]) * len(offsets)
+    results = []
+    for user_id in user_ids:
+        seen[user_id] = user_id
+        frontier = [user_id]
+        reach = 0
+        total = 0
+        depth = 0
+        while len(frontier) > 0:
+            depth += 1
+            next_frontier = []
+            for current in frontier:
+                for friend_id in friends[offsets[current]:offsets[current + 1]]:
+                    if seen[friend_id] != user_id:
+                        seen[friend_id] = user_id
+                        next_frontier.append(friend_id)
+            reach += len(next_frontier)
+            total += depth * len(next_frontier)
+            frontier = next_frontier
+        results.append((user_id, reach, total))
+    return results
+
+
+def _worker_stats(user_ids):
+    return _user_stats(_offsets, _friends, user_ids)
+
+
+def network_statistics(social_graph, users=None, max_workers=None, chunk_size=256):
+    """
+    Return a dictionary mapping each user ID to the same statistics
+    SocialGraph.get_network_stats gives: "reach", "coverage" and
+    "average_separation".
+
+    users limits the job to some user IDs (all users by default).
+    max_workers=1 runs in this process, anything else spreads groups of
+    chunk_size users over a process pool that reads the friendships from
+    shared memory. Every user still costs one BFS over their network, so
+    the total work is O(users * friendships).
+    """
+    if users is None:
+        users = range(1, social_graph.last_id + 1)
+    users = list(users)
+    offsets, friends = _compact_friendships(social_graph)
+    chunks = [users[i:i + chunk_size] for i in range(0, len(users), chunk_size)]
+
+    if max_workers == 1:
+        results = [_user_stats(offsets, friends, chunk) for chunk in chunks]
+    else:
+        with SharedArrays(offsets, friends) as shared:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_attach_shared_friendships,
+                initargs=(shared.specs,)
+            ) as pool:
+                results = list(pool.map(_worker_stats, chunks))
+
+    others = len(social_graph.users) - 1
+    stats = {}
+    for chunk in results:
+        for user_id, reach, total in chunk:
+            stats[user_id] = {
+                "reach": reach,
+                "coverage": reach / others if others > 0 else 0.0,
+                "average_separation": total / reach if reach > 0 else 0.0,
+            }
+    return stats
+
+
+def summarize(stats):
+    """
+    Average the per-user statistics over all users, as in the notes at
+    the bottom of social.py.
+    """
+    count = len(stats)
+    return {
+        "coverage": sum(user["coverage"] for user in stats.values()) / count,
+        "average_separation": sum(user["average_separation"] for user in stats.values()) / count,
+    }
+
+
+if __name__ == '__main__':
+    num_users = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    avg_friendships = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    sg = SocialGraph()
+    sg.populate_graph(num_users, avg_friendships, mode="sample")
+    start = time.perf_counter()
+    summary = summarize(network_statistics(sg))
+    elapsed = time.perf_counter() - start
+    print(f"{num_users} users, {avg_friendships} friends on average, {elapsed:.2f}s")
+    print(f"  network coverage     {summary['coverage'] * 100:.1f}%")
+    print(f"  degrees of separation {summary['average_separation']:.2f}")
@@ -0,0 +1,39 @@
+"""
+Benchmark the two SocialGraph.populate_graph modes and compare the
+degree distributions they produce.
+
+Run with: python bench_populate.py
+
+The shuffle mode builds all N**2 / 2 possible friendships, so it is
+skipped above SHUFFLE_LIMIT users (100k users would be 5 billion pairs).
+"""
+import statistics
+import time
+
+from social import SocialGraph
+
+SHUFFLE_LIMIT = 10000
+
+
+def degree_summary(social_graph):
+    degrees = [len(friends) for friends in social_graph.friendships.values()]
+    return statistics.mean(degrees), statistics.pstdev(degrees), max(degrees)
+
+
+def main(sizes=(1000, 10000, 100000), avg_friendships=5, seed=1):
+    print(f"{'users':>7} {'mode':>8} {'time':>9} {'mean deg':>9} {'stdev':>6} {'max':>4}")
+    for num_users in sizes:
+        for mode in ("shuffle", "sample"):
+            if mode == "shuffle" and num_users > SHUFFLE_LIMIT:
+                print(f"{num_users:>7} {mode:>8} {'skipped':>9}")
+                continue
+            social_graph = SocialGraph()
+            start = time.perf_counter()
+            social_graph.populate_graph(num_users, avg_friendships, mode=mode, seed=seed)
+            elapsed = time.perf_counter() - start
+            mean, stdev, most = degree_summary(social_graph)
+            print(f"{num_users:>7} {mode:>8} {elapsed:>8.3f}s {mean:>9.2f} {stdev:>6.2f} {most:>4}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""
+Social graph storage split into shards of memory-mapped files
+"""
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+from collections.abc import Mapping
+
+from social import SocialPaths
+
+# values written at a time when a mapped array grows
+FILL_PIECE = 1 << 16
+METADATA_FILE = "graph.json"
+
+
+class _MappedArray:
+    """
+    A growable array of int64 values stored in a memory-mapped file.
+    An existing file is opened as it is, with at least length values.
+    """
+    def __init__(self, path, length, fill=0):
+        self.path = path
+        self.fill = fill
+        if not os.path.exists(path):
+            with open(path, "wb"):
+                pass
+        self.file = open(path, "r+b")
+        self.length = os.path.getsize(path) // 8
+        self.map = None
+        self.values = None
+        self.grow(max(length, self.length))
+
+    def _unmap(self):
+        if self.values is not None:
+            self.values.release()
+            self.map.close()
+            self.values = None
+            self.map = None
+
+    def grow(self, length):
+        # extend the file (the new part reads as zeros without taking up
+        # memory or disk), map it again and write the fill value over
+        # the new part a piece at a time
+        self._unmap()
+        old_length = self.length
+        self.file.truncate(length * 8)
+        self.length = length
+        self.map = mmap.mmap(self.file.fileno(), length * 8)
+        self.values = memoryview(self.map).cast("q")
+        if self.fill != 0 and length > old_length:
+            piece = array("q", [self.fill]) * min(FILL_PIECE, length - old_length)
+            for start in range(old_length, length, FILL_PIECE):
+                end = min(start + FILL_PIECE, length)
+                self.values[start:end] = piece[:end - start]
+
+    def close(self):
+        self._unmap()
+        self.file.close()
+
+
+class _Shard:
+    """
+    The users of one ID range: their names and their friendships.
+
+    Friendships are singly linked lists in an edge file. heads[i] is the
+    first edge record of the shard's i-th user (-1 if none), and record r
+    is the friend ID at edges[2 * r] and the next record at
+    edges[2 * r + 1].
+    """
+    def __init__(self, directory, shard_size):
+        os.makedirs(directory, exist_ok=True)
+        self.heads = _MappedArray(os.path.join(directory, "heads"), shard_size, fill=-1)
+        self.edges = _MappedArray(os.path.join(directory, "edges"), 1024, fill=-1)
+        self.num_edges = 0
+        # start and length of each user's name in the names file
+        self.name_spans = _MappedArray(os.path.join(directory, "name_spans"), 2 * shard_size)
+        names_path = os.path.join(directory, "names")
+        self.names = open(names_path, "r+b" if os.path.exists(names_path) else "w+b")
+
+    def set_name(self, i, name):
+        encoded = name.encode("utf-8")
+        self.names.seek(0, os.SEEK_END)
+        self.name_spans.values[2 * i] = self.names.tell()
+        self.name_spans.values[2 * i + 1] = len(encoded)
+        self.names.write(encoded)
+
+    def get_name(self, i):
+        self.names.flush()
+        self.names.seek(self.name_spans.values[2 * i])
+        return self.names.read(self.name_spans.values[2 * i + 1]).decode("utf-8")
+
+    def friends(self, i):
+        edges = self.edges.values
+        record = self.heads.values[i]
+        while record >= 0:
+            yield edges[2 * record]
+            record = edges[2 * record + 1]
+
+    def add_friend(self, i, friend_id):
+        if 2 * (self.num_edges + 1) > self.edges.length:
+            self.edges.grow(2 * self.edges.length)
+        record = self.num_edges
+        self.num_edges += 1
+        self.edges.values[2 * record] = friend_id
+        self.edges.values[2 * record + 1] = self.heads.values[i]
+        self.heads.values[i] = record
+
+    def close(self):
+        self.heads.close()
+        self.edges.close()
+        self.name_spans.close()
+        self.names.close()
+
+
+class _ShardedParents(Mapping):
+    """
+    Read-only user ID -> parent mapping over one parent array per shard,
+    where 0 marks users the search has not reached.
+    """
+    def __init__(self, parents, shard_size, count):
+        self.parents = parents
+        self.shard_size = shard_size
+        self.count = count
+
+    def __getitem__(self, user_id):
+        shard_id, i = divmod(user_id - 1, self.shard_size)
+        if shard_id not in self.parents or self.parents[shard_id][i] == 0:
+            raise KeyError(user_id)
+        return self.parents[shard_id][i]
+
+    def __iter__(self):
+        for shard_id in sorted(self.parents):
+            first_id = shard_id * self.shard_size + 1
+            for i, parent in enumerate(self.parents[shard_id]):
+                if parent != 0:
+                    yield first_id + i
+
+    def __len__(self):
+        return self.count
+
+
+class ShardedSocialGraph:
+    """
+    A SocialGraph whose users are split by ID range into shards of
+    shard_size users (1 << 20 by default). Each shard keeps its names
+    and friendships in memory-mapped files under directory, so the
+    operating system pages them in and out as needed.
+
+    A directory that holds a graph saved by close() is reopened, with
+    the shard size it was created with. Any other non-empty directory
+    is refused. Without a directory the graph lives in a new temporary
+    directory that close() deletes.
+    """
+    def __init__(self, directory=None, shard_size=None):
+        self.owns_directory = directory is None
+        self.directory = directory if directory is not None else tempfile.mkdtemp(prefix="social-")
+        self.shards = []
+        self.closed = False
+        metadata_path = os.path.join(self.directory, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path, "r") as metadata_file:
+                metadata = json.load(metadata_file)
+            if shard_size is not None and shard_size != metadata["shard_size"]:
+                raise ValueError(f"{self.directory} holds shards of {metadata['shard_size']} users, not {shard_size}")
+            self.shard_size = metadata["shard_size"]
+            self.last_id = metadata["last_id"]
+            for shard_id, num_edges in enumerate(metadata["num_edges"]):
+                shard = _Shard(os.path.join(self.directory, f"shard-{shard_id}"), self.shard_size)
+                shard.num_edges = num_edges
+                self.shards.append(shard)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            if len(os.listdir(self.directory)) > 0:
+                raise ValueError(f"{self.directory} is not empty and holds no saved social graph")
+            self.shard_size = shard_size if shard_size is not None else 1 << 20
+            self.last_id = 0
+            self._save_metadata()
+
+    def _save_metadata(self):
+        metadata = {
+            "shard_size": self.shard_size,
+            "last_id": self.last_id,
+            "num_edges": [shard.num_edges for shard in self.shards],
+        }
+        with open(os.path.join(self.directory, METADATA_FILE), "w") as metadata_file:
+            json.dump(metadata, metadata_file)
+
+    def _locate(self, user_id):
+        if user_id < 1 or user_id > self.last_id:
+            raise KeyError(user_id)
+        shard_id, i = divmod(user_id - 1, self.shard_size)
+        return self.shards[shard_id], i
+
+    def add_user(self, name):
+        """
+        Create a new user with a sequential integer ID
+        """
+        self.last_id += 1  # automatically increment the ID to assign the new user
+        shard_id, i = divmod(self.last_id - 1, self.shard_size)
+        if shard_id == len(self.shards):
+            self.shards.append(_Shard(os.path.join(self.directory, f"shard-{shard_id}"), self.shard_size))
+        self.shards[shard_id].set_name(i, name)
+
+    def get_name(self, user_id):
+        shard, i = self._locate(user_id)
+        return shard.get_name(i)
+
+    def get_friends(self, user_id):
+        shard, i = self._locate(user_id)
+        return set(shard.friends(i))
+
+    def add_friendship(self, user_id, friend_id):
+        """
+        Creates a bi-directional friendship
+        """
+        user_shard, i = self._locate(user_id)
+        friend_shard, j = self._locate(friend_id)
+        if user_id == friend_id:
+            print("WARNING: You cannot be friends with yourself")
+        elif friend_id in user_shard.friends(i):
+            print("WARNING: Friendship already exists")
+        else:
+            user_shard.add_friend(i, friend_id)
+            friend_shard.add_friend(j, user_id)
+
+    def get_all_social_paths(self, user_id, lazy=False):
+        """
+        Takes a user's user_id as an argument
+
+        Returns a dictionary containing every user in that user's
+        extended network with the shortest friendship path between them,
+        or a lazy SocialPaths mapping with lazy=True.
+
+        The search runs one level at a time. Every shard expands the
+        frontier users it owns, and the friends found are handed in one
+        batch to the shard that owns them, which keeps the ones it has
+        not seen yet as its part of the next frontier.
+        """
+        shard, i = self._locate(user_id)
+        # one parent array per shard the search reaches
+        parents = {}
+        start_shard = (user_id - 1) // self.shard_size
+        parents[start_shard] = array("q", bytes(8 * self.shard_size))
+        parents[start_shard][i] = user_id
+        count = 1
+        frontier = {start_shard: [user_id]}
+
+        while len(frontier) > 0:
+            # expand: each shard lists (friend, parent) pairs by owner
+            outgoing = {}
+            for shard_id, users in frontier.items():
+                shard = self.shards[shard_id]
+                first_id = shard_id * self.shard_size + 1
+                for current_user_id in users:
+                    for friend_id in shard.friends(current_user_id - first_id):
+                        owner = (friend_id - 1) // self.shard_size
+                        outgoing.setdefault(owner, []).append((friend_id, current_user_id))
+
+            # exchange: each owner keeps the friends it has not seen yet
+            frontier = {}
+            for owner, batch in outgoing.items():
+                if owner not in parents:
+                    parents[owner] = array("q", bytes(8 * self.shard_size))
+                owner_parents = parents[owner]
+                first_id = owner * self.shard_size + 1
+                next_users = []
+                for friend_id, parent_id in batch:
+                    if owner_parents[friend_id - first_id] == 0:
+                        owner_parents[friend_id - first_id] = parent_id
+                        next_users.append(friend_id)
+                if len(next_users) > 0:
+                    frontier[owner] = next_users
+                    count += len(next_users)
+
+        paths = SocialPaths(_ShardedParents(parents, self.shard_size, count))
+        if lazy:
+            return paths
+        return dict(paths)
+
+    def close(self):
+        """
+        Save the graph's metadata and close its files, or delete them if
+        the graph was created in a temporary directory.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if not self.owns_directory:
+            self._save_metadata()
+        for shard in self.shards:
+            shard.close()
+        self.shards = []
+        if self.owns_directory:
+            shutil.rmtree(self.directory)
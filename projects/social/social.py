@@ -1,11 +1,40 @@
 import random
+from collections.abc import Mapping
 from util import Queue
 
 class User:
+    __slots__ = ("name",)
+
     def __init__(self, name):
         self.name = name
 
 
+class SocialPaths(Mapping):
+    """
+    Read-only dictionary of user ID -> shortest friendship path that
+    only stores each user's predecessor and rebuilds a path when it
+    is looked up.
+    """
+    def __init__(self, parents):
+        # the starting user is their own parent
+        self.parents = parents
+
+    def __getitem__(self, user_id):
+        parents = self.parents
+        path = [user_id]
+        while parents[user_id] != user_id:
+            user_id = parents[user_id]
+            path.append(user_id)
+        path.reverse()
+        return path
+
+    def __iter__(self):
+        return iter(self.parents)
+
+    def __len__(self):
+        return len(self.parents)
+
+
 class SocialGraph:
     def __init__(self):
         self.last_id = 0
@@ -32,7 +61,7 @@ class SocialGraph:
         self.users[self.last_id] = User(name)
         self.friendships[self.last_id] = set()
 
-    def populate_graph(self, num_users, avg_friendships):
+    def populate_graph(self, num_users, avg_friendships, mode="shuffle", seed=None):
         """
         Takes a number of users and an average number of friendships
         as arguments
@@ -41,7 +70,20 @@ class SocialGraph:
         between those users.
 
         The number of users must be greater than the average number of friendships.
+
+        mode="shuffle" shuffles every possible friendship and keeps the
+        first ones, which costs O(num_users ** 2). mode="sample" draws
+        random pairs and retries on collisions, which costs
+        O(num_users * avg_friendships) and picks from the same uniform
+        distribution. Pass a seed to make either mode reproducible.
         """
+        if mode not in ("shuffle", "sample"):
+            raise ValueError(f"Unknown populate mode: {mode}")
+        num_friendships = num_users * avg_friendships // 2
+        if num_friendships > num_users * (num_users - 1) // 2:
+            raise ValueError(f"{num_users} users cannot have {avg_friendships} friendships on average")
+        rng = random if seed is None else random.Random(seed)
+
         # Reset graph
         self.last_id = 0
         self.users = {}
@@ -51,6 +93,19 @@ class SocialGraph:
         for i in range(0, num_users):
             self.add_user(f"User {i + 1}")
 
+        if mode == "sample":
+            # Randomly pick pairs until there are enough friendships,
+            # skipping self friendships and ones that already exist
+            created = 0
+            while created < num_friendships:
+                user_id = rng.randint(1, self.last_id)
+                friend_id = rng.randint(1, self.last_id)
+                if user_id != friend_id and friend_id not in self.friendships[user_id]:
+                    self.friendships[user_id].add(friend_id)
+                    self.friendships[friend_id].add(user_id)
+                    created += 1
+            return
+
         # Create friendships
         # Generate ALL possible friendships
         # avoid duplicate friendships
@@ -62,39 +117,71 @@ class SocialGraph:
         # Randomly select x friendships
         # the formula for X is num_users * avg_friendships // 2
         # shuffle the array and pick x elements from the front
-        random.shuffle(possible_friendships)
-        num_friendships = num_users * avg_friendships // 2
+        rng.shuffle(possible_friendships)
         for i in range(0, num_friendships):
             friendship = possible_friendships[i]
             self.add_friendship(friendship[0], friendship[1])
 
-    def get_all_social_paths(self, user_id):
+    def get_social_parents(self, user_id):
         """
         Takes a user's user_id as an argument
 
-        Returns a dictionary containing every user in that user's
-        extended network with the shortest friendship path between them.
-
-        The key is the friend's ID and the value is the path.
+        Runs a breadth-first search over that user's extended network and
+        returns two dictionaries: the friend each user was first reached
+        through (the user is their own parent) and the degrees of
+        separation (number of friendship hops) of each user.
         """
-        visited = {}  # Note that this is a dictionary, not a set
+        parents = {user_id: user_id}
+        depths = {user_id: 0}
 
         queue = Queue()
-        queue.enqueue([user_id])
+        queue.enqueue(user_id)
 
         while queue.size() > 0:
-            current_path = queue.dequeue()
-            current_user_id = current_path[-1]
+            current_user_id = queue.dequeue()
+            depth = depths[current_user_id] + 1
 
-            if current_user_id not in visited:
-                visited[current_user_id] = current_path
+            for friend_id in self.friendships[current_user_id]:
+                if friend_id not in parents:
+                    parents[friend_id] = current_user_id
+                    depths[friend_id] = depth
+                    queue.enqueue(friend_id)
 
-                for friend_id in self.friendships[current_user_id]:
-                    new_path = current_path.copy()
-                    new_path.append(friend_id)
-                    queue.enqueue(new_path)
+        return parents, depths
 
-        return visited
+    def get_all_social_paths(self, user_id, lazy=False):
+        """
+        Takes a user's user_id as an argument
+
+        Returns a dictionary containing every user in that user's
+        extended network with the shortest friendship path between them.
+
+        The key is the friend's ID and the value is the path.
+
+        With lazy=True a SocialPaths mapping is returned instead, which
+        only builds a path when that friend's ID is looked up.
+        """
+        paths = SocialPaths(self.get_social_parents(user_id)[0])
+        if lazy:
+            return paths
+        return dict(paths)
+
+    def get_network_stats(self, user_id):
+        """
+        Takes a user's user_id as an argument
+
+        Returns a dictionary with the number of other users in that
+        user's extended network ("reach"), the share of all other users
+        that is ("coverage") and the average number of friendship hops
+        to them ("average_separation"), straight from the search depths.
+        """
+        depths = self.get_social_parents(user_id)[1]
+        reach = len(depths) - 1
+        return {
+            "reach": reach,
+            "coverage": reach / (len(self.users) - 1) if len(self.users) > 1 else 0.0,
+            "average_separation": sum(depths.values()) / reach if reach > 0 else 0.0,
+        }
 
 """
 Part 3
@@ -0,0 +1,123 @@
+import unittest
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from social import SocialGraph
+from sharded import ShardedSocialGraph
+from analytics import network_statistics
+
+class Test(unittest.TestCase):
+
+    def friendship_count(self, social_graph):
+        return sum(len(friends) for friends in social_graph.friendships.values()) // 2
+
+    def test_populate_graph(self):
+        for mode in ("shuffle", "sample"):
+            first = SocialGraph()
+            first.populate_graph(50, 4, mode=mode, seed=7)
+            second = SocialGraph()
+            second.populate_graph(50, 4, mode=mode, seed=7)
+            self.assertDictEqual(first.friendships, second.friendships)
+            self.assertEqual(len(first.users), 50)
+            self.assertEqual(self.friendship_count(first), 100)
+            for user_id, friends in first.friendships.items():
+                self.assertNotIn(user_id, friends)
+
+        # every possible friendship
+        full = SocialGraph()
+        full.populate_graph(5, 4, mode="sample", seed=1)
+        self.assertEqual(self.friendship_count(full), 10)
+
+    def test_populate_graph_too_many_friendships(self):
+        social_graph = SocialGraph()
+        self.assertRaises(ValueError, social_graph.populate_graph, 4, 5, mode="sample")
+        self.assertRaises(ValueError, social_graph.populate_graph, 4, 5, mode="shuffle")
+        self.assertRaises(ValueError, social_graph.populate_graph, 10, 2, mode="other")
+
+    def test_network_statistics(self):
+        social_graph = SocialGraph()
+        social_graph.populate_graph(60, 3, mode="sample", seed=3)
+        stats = network_statistics(social_graph, max_workers=1)
+        for user_id in (1, 30, 60):
+            self.assertDictEqual(stats[user_id], social_graph.get_network_stats(user_id))
+        self.assertDictEqual(network_statistics(social_graph, max_workers=2, chunk_size=16), stats)
+
+    def test_social_paths(self):
+        social_graph = SocialGraph()
+        self.build(social_graph, 7, [(1, 2), (2, 3), (3, 4), (1, 5), (5, 4), (6, 7)])
+
+        parents, depths = social_graph.get_social_parents(1)
+        self.assertDictEqual(depths, {1: 0, 2: 1, 5: 1, 3: 2, 4: 2})
+        self.assertEqual(parents[1], 1)
+        self.assertEqual(parents[4], 5)
+
+        paths = social_graph.get_all_social_paths(1, lazy=True)
+        eager = social_graph.get_all_social_paths(1)
+        self.assertDictEqual(eager, {1: [1], 2: [1, 2], 5: [1, 5], 3: [1, 2, 3], 4: [1, 5, 4]})
+        self.assertEqual(len(paths), len(eager))
+        self.assertListEqual(sorted(paths), sorted(eager))
+        for user_id in paths:
+            self.assertListEqual(paths[user_id], eager[user_id])
+            self.assertEqual(len(paths[user_id]) - 1, depths[user_id])
+        self.assertRaises(KeyError, paths.__getitem__, 6)
+        self.assertNotIn(7, paths)
+        self.assertIsNone(paths.get(6))
+        self.assertDictEqual(dict(social_graph.get_all_social_paths(6, lazy=True)), {6: [6], 7: [6, 7]})
+
+    def build(self, social_graph, num_users, friendships):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            for i in range(num_users):
+                social_graph.add_user(f"User {i + 1}")
+            for user_id, friend_id in friendships:
+                social_graph.add_friendship(user_id, friend_id)
+        return output.getvalue()
+
+    def test_sharded_social_graph(self):
+        # friendships across shards of 4 users, plus a duplicate and a self friendship
+        friendships = [(1, 2), (2, 5), (5, 9), (9, 10), (3, 7), (7, 11), (4, 4), (5, 2), (11, 3)]
+        social_graph = SocialGraph()
+        warnings = self.build(social_graph, 12, friendships)
+        self.assertEqual(warnings.count("WARNING: Friendship already exists"), 1)
+        self.assertEqual(warnings.count("WARNING: You cannot be friends with yourself"), 1)
+
+        sharded = ShardedSocialGraph(shard_size=4)
+        directory = sharded.directory
+        self.assertEqual(self.build(sharded, 12, friendships), warnings)
+        for user_id in range(1, 13):
+            self.assertEqual(sharded.get_name(user_id), social_graph.users[user_id].name)
+            self.assertSetEqual(sharded.get_friends(user_id), social_graph.friendships[user_id])
+            expected = social_graph.get_all_social_paths(user_id)
+            paths = sharded.get_all_social_paths(user_id)
+            self.assertSetEqual(set(paths), set(expected))
+            for other_id, path in paths.items():
+                self.assertEqual(len(path), len(expected[other_id]))
+                self.assertEqual(path[0], user_id)
+                self.assertEqual(path[-1], other_id)
+        self.assertRaises(KeyError, sharded.get_name, 13)
+        sharded.close()
+        self.assertFalse(os.path.exists(directory))
+
+    def test_sharded_social_graph_reopen(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sharded = ShardedSocialGraph(directory, shard_size=4)
+            self.build(sharded, 6, [(1, 2), (2, 6), (3, 5)])
+            sharded.close()
+            self.assertTrue(os.path.exists(directory))
+
+            sharded = ShardedSocialGraph(directory)
+            self.assertEqual(sharded.shard_size, 4)
+            self.assertEqual(sharded.get_name(6), "User 6")
+            self.assertSetEqual(sharded.get_friends(2), {1, 6})
+            sharded.add_user("User 7")
+            sharded.add_friendship(7, 1)
+            self.assertDictEqual(sharded.get_all_social_paths(7), {7: [7], 1: [7, 1], 2: [7, 1, 2], 6: [7, 1, 2, 6]})
+            self.assertRaises(ValueError, ShardedSocialGraph, directory, shard_size=8)
+            sharded.close()
+
+            os.remove(os.path.join(directory, "graph.json"))
+            self.assertRaises(ValueError, ShardedSocialGraph, directory)
+
+if __name__ == '__main__':
+    unittest.main()
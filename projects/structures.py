@@ -0,0 +1,47 @@
+"""
+Queue and Stack shared by all of the graph projects
+"""
+from collections import deque
+
+
+class Queue():
+    """
+    First-in first-out queue backed by a deque, so both ends are O(1).
+    """
+    def __init__(self):
+        self.queue = deque()
+    def enqueue(self, value):
+        self.queue.append(value)
+    def extend(self, values):
+        """
+        Enqueue every value of an iterable in order.
+        """
+        self.queue.extend(values)
+    def dequeue(self):
+        if self.size() > 0:
+            return self.queue.popleft()
+        else:
+            return None
+    def size(self):
+        return len(self.queue)
+
+class Stack():
+    """
+    Last-in first-out stack backed by a list.
+    """
+    def __init__(self):
+        self.stack = []
+    def push(self, value):
+        self.stack.append(value)
+    def extend(self, values):
+        """
+        Push every value of an iterable in order, so the last one ends up on top.
+        """
+        self.stack.extend(values)
+    def pop(self):
+        if self.size() > 0:
+            return self.stack.pop()
+        else:
+            return None
+    def size(self):
+        return len(self.stack)